@@ -20,8 +20,19 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.models import Base
+from backend.config import DATABASE_URL
 target_metadata = Base.metadata
 
+# Gleiche Datenbank wie die App (LOKARNI_DATABASE_URL bzw. lokarni.ini)
+config.set_main_option("sqlalchemy.url", DATABASE_URL)
+
+
+def include_name(name, type_, parent_names):
+    # FTS5-Index und seine Schattentabellen werden per DDL verwaltet, nicht per Autogenerate
+    if type_ == "table" and name.startswith("assets_fts"):
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -30,6 +41,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -42,7 +54,11 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,61 @@
+"""add asset_trigrams table
+
+Revision ID: 0b7e5c2d9a64
+Revises: f6a0d3b85e19
+Create Date: 2026-10-18 18:27:03.845512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e5c2d9a64'
+down_revision: Union[str, None] = 'f6a0d3b85e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_FIELDS = ['name', 'trigger_words', 'tags', 'slug']
+
+
+def text_trigrams(text):
+    grams = set()
+    for word in (text or "").lower().replace(",", " ").split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # Tabelle kann bereits durch create_all beim App-Start angelegt worden sein
+    if not sa.inspect(bind).has_table('asset_trigrams'):
+        op.create_table('asset_trigrams',
+        sa.Column('trigram', sa.String(), nullable=False),
+        sa.Column('asset_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('trigram', 'asset_id')
+        )
+        op.create_index(op.f('ix_asset_trigrams_asset_id'), 'asset_trigrams', ['asset_id'], unique=False)
+
+    # Trigramme aller bestehenden Assets aufbauen
+    bind.execute(sa.text("DELETE FROM asset_trigrams"))
+    rows = bind.execute(sa.text(f"SELECT id, {', '.join(TRIGRAM_FIELDS)} FROM assets")).fetchall()
+    for row in rows:
+        grams = text_trigrams(" ".join(value or "" for value in row[1:]))
+        if grams:
+            bind.execute(
+                sa.text("INSERT INTO asset_trigrams (trigram, asset_id) VALUES (:trigram, :asset_id)"),
+                [{"trigram": gram, "asset_id": row[0]} for gram in grams],
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_asset_trigrams_asset_id'), table_name='asset_trigrams')
+    op.drop_table('asset_trigrams')
@@ -0,0 +1,55 @@
+"""add category_members table
+
+Revision ID: 4d8c1f3a7b52
+Revises: b9f2a6e4c187
+Create Date: 2026-10-18 14:55:31.620447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8c1f3a7b52'
+down_revision: Union[str, None] = 'b9f2a6e4c187'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BUILTIN_CATEGORY_KEYWORDS = {'all assets', 'favorites', 'favoriten'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # Tabelle kann bereits durch create_all beim App-Start angelegt worden sein
+    if not sa.inspect(bind).has_table('category_members'):
+        op.create_table('category_members',
+        sa.Column('keyword', sa.String(), nullable=False),
+        sa.Column('asset_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('keyword', 'asset_id')
+        )
+        op.create_index(op.f('ix_category_members_asset_id'), 'category_members', ['asset_id'], unique=False)
+
+    # Zuordnung für alle bestehenden Subkategorie-Namen aufbauen
+    bind.execute(sa.text("DELETE FROM category_members"))
+    names = bind.execute(sa.text("SELECT DISTINCT name FROM subcategories")).scalars()
+    keywords = {name.lower() for name in names if name} - BUILTIN_CATEGORY_KEYWORDS
+    for keyword in keywords:
+        bind.execute(
+            sa.text(
+                "INSERT OR IGNORE INTO category_members (keyword, asset_id) "
+                "SELECT :keyword, id FROM assets WHERE instr(search_text, :keyword) > 0"
+            ),
+            {"keyword": keyword},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_members_asset_id'), table_name='category_members')
+    op.drop_table('category_members')
@@ -0,0 +1,56 @@
+"""add nsfw_rating and filter indexes to Asset
+
+Revision ID: 5e3a9c7d1f48
+Revises: 0b7e5c2d9a64
+Create Date: 2026-10-18 19:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e3a9c7d1f48'
+down_revision: Union[str, None] = '0b7e5c2d9a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def nsfw_rating(value) -> int:
+    # Gleiche Regel wie models.nsfw_rating
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    text = str(value).strip()
+    return int(text) if text.isdecimal() else 1
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    columns = [column['name'] for column in sa.inspect(bind).get_columns('assets')]
+    if 'nsfw_rating' not in columns:
+        op.add_column('assets', sa.Column('nsfw_rating', sa.Integer(), nullable=False, server_default='0'))
+
+    # Ein UPDATE pro unterschiedlichem nsfw_level statt pro Asset
+    levels = bind.execute(sa.text("SELECT DISTINCT nsfw_level FROM assets WHERE nsfw_level IS NOT NULL")).scalars().all()
+    updates = [{"level": level, "rating": nsfw_rating(level)} for level in levels]
+    if updates:
+        bind.execute(sa.text("UPDATE assets SET nsfw_rating = :rating WHERE nsfw_level = :level"), updates)
+
+    op.create_index('ix_assets_nsfw_rating', 'assets', ['nsfw_rating'], unique=False, if_not_exists=True)
+    op.create_index('ix_assets_favorite_nsfw', 'assets', ['is_favorite', 'nsfw_rating'], unique=False, if_not_exists=True)
+    op.create_index('ix_assets_type_nsfw', 'assets', ['type', 'nsfw_rating'], unique=False, if_not_exists=True)
+    op.create_index('ix_assets_subcategory_nsfw', 'assets', ['subcategory_id', 'nsfw_rating'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assets_subcategory_nsfw', table_name='assets')
+    op.drop_index('ix_assets_type_nsfw', table_name='assets')
+    op.drop_index('ix_assets_favorite_nsfw', table_name='assets')
+    op.drop_index('ix_assets_nsfw_rating', table_name='assets')
+    op.drop_column('assets', 'nsfw_rating')
@@ -0,0 +1,75 @@
+"""add assets_fts full-text index
+
+Revision ID: 7c1e4b9a2d30
+Revises: 2f148711117a
+Create Date: 2026-10-18 10:12:41.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9a2d30'
+down_revision: Union[str, None] = '2f148711117a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_COLUMNS = [
+    'name',
+    'description',
+    'tags',
+    'trigger_words',
+    'positive_prompt',
+    'negative_prompt',
+    'used_resources',
+    'type',
+    'model_version',
+    'base_model',
+    'slug',
+    'creator',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+    op.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+            {columns},
+            content='assets', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_fts_ai AFTER INSERT ON assets BEGIN
+            INSERT INTO assets_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_fts_ad AFTER DELETE ON assets BEGIN
+            INSERT INTO assets_fts(assets_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_fts_au AFTER UPDATE OF {columns} ON assets BEGIN
+            INSERT INTO assets_fts(assets_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO assets_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+
+    # Index aus den bestehenden Assets aufbauen
+    op.execute("INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS assets_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS assets_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS assets_fts_ai")
+    op.execute("DROP TABLE IF EXISTS assets_fts")
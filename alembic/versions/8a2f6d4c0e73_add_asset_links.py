@@ -0,0 +1,93 @@
+"""move linked_assets into asset_links table
+
+Revision ID: 8a2f6d4c0e73
+Revises: 5e3a9c7d1f48
+Create Date: 2026-10-18 19:41:12.530917
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a2f6d4c0e73'
+down_revision: Union[str, None] = '5e3a9c7d1f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _link_ids(value):
+    # JSON-Listen enthielten Zahlen und teils Zahlen als Strings
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if not isinstance(value, list):
+        return []
+    ids = []
+    for item in value:
+        if isinstance(item, str) and item.isdigit():
+            item = int(item)
+        if isinstance(item, int) and not isinstance(item, bool):
+            ids.append(item)
+    return ids
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Tabelle kann bereits durch create_all beim App-Start angelegt worden sein
+    if not inspector.has_table('asset_links'):
+        op.create_table('asset_links',
+        sa.Column('asset_id', sa.Integer(), nullable=False),
+        sa.Column('linked_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['linked_id'], ['assets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('asset_id', 'linked_id')
+        )
+        op.create_index(op.f('ix_asset_links_linked_id'), 'asset_links', ['linked_id'], unique=False)
+
+    if 'linked_assets' not in [column['name'] for column in inspector.get_columns('assets')]:
+        return
+
+    # Bestehende JSON-Listen übernehmen, jede Verknüpfung in beide Richtungen,
+    # verwaiste IDs (gelöschte Assets) und Selbstverweise fallen weg
+    existing = set(bind.execute(sa.text("SELECT id FROM assets")).scalars())
+    pairs = set()
+    for asset_id, value in bind.execute(sa.text("SELECT id, linked_assets FROM assets WHERE linked_assets IS NOT NULL")):
+        for linked_id in _link_ids(value):
+            if linked_id != asset_id and linked_id in existing:
+                pairs.add((asset_id, linked_id))
+                pairs.add((linked_id, asset_id))
+    if pairs:
+        bind.execute(
+            sa.text("INSERT OR IGNORE INTO asset_links (asset_id, linked_id) VALUES (:asset_id, :linked_id)"),
+            [{"asset_id": asset_id, "linked_id": linked_id} for asset_id, linked_id in sorted(pairs)],
+        )
+
+    op.drop_column('assets', 'linked_assets')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('assets', sa.Column('linked_assets', sqlite.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    links = {}
+    for asset_id, linked_id in bind.execute(sa.text("SELECT asset_id, linked_id FROM asset_links ORDER BY asset_id, linked_id")):
+        links.setdefault(asset_id, []).append(linked_id)
+    if links:
+        bind.execute(
+            sa.text("UPDATE assets SET linked_assets = :linked_assets WHERE id = :id"),
+            [{"id": asset_id, "linked_assets": json.dumps(ids)} for asset_id, ids in links.items()],
+        )
+
+    op.drop_index(op.f('ix_asset_links_linked_id'), table_name='asset_links')
+    op.drop_table('asset_links')
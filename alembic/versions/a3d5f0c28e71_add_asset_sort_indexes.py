@@ -0,0 +1,32 @@
+"""add asset sort indexes for keyset pagination
+
+Revision ID: a3d5f0c28e71
+Revises: 7c1e4b9a2d30
+Create Date: 2026-10-18 11:02:17.553901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5f0c28e71'
+down_revision: Union[str, None] = '7c1e4b9a2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_assets_name_id', 'assets', ['name', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_assets_created_at_id', 'assets', [sa.text("coalesce(created_at, '')"), 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_assets_favorite_id', 'assets', [sa.text("coalesce(is_favorite, 0)"), 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assets_favorite_id', table_name='assets')
+    op.drop_index('ix_assets_created_at_id', table_name='assets')
+    op.drop_index('ix_assets_name_id', table_name='assets')
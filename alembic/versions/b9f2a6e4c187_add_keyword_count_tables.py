@@ -0,0 +1,87 @@
+"""add keyword count tables
+
+Revision ID: b9f2a6e4c187
+Revises: e41b7d6c9f02
+Create Date: 2026-10-18 13:41:09.377215
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f2a6e4c187'
+down_revision: Union[str, None] = 'e41b7d6c9f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEYWORD_FIELDS = [
+    'name',
+    'tags',
+    'trigger_words',
+    'positive_prompt',
+    'negative_prompt',
+    'used_resources',
+    'type',
+    'model_version',
+    'base_model',
+    'slug',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Tabellen können bereits durch create_all beim App-Start angelegt worden sein
+    if not inspector.has_table('asset_keywords'):
+        op.create_table('asset_keywords',
+        sa.Column('asset_id', sa.Integer(), nullable=False),
+        sa.Column('keyword', sa.String(), nullable=False),
+        sa.Column('frequency', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('asset_id', 'keyword')
+        )
+        op.create_index(op.f('ix_asset_keywords_keyword'), 'asset_keywords', ['keyword'], unique=False)
+    if not inspector.has_table('keyword_counts'):
+        op.create_table('keyword_counts',
+        sa.Column('keyword', sa.String(), nullable=False),
+        sa.Column('frequency', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('keyword')
+        )
+        op.create_index(op.f('ix_keyword_counts_frequency'), 'keyword_counts', ['frequency'], unique=False)
+
+    # Tokens aller bestehenden Assets einlesen
+    bind.execute(sa.text("DELETE FROM asset_keywords"))
+    bind.execute(sa.text("DELETE FROM keyword_counts"))
+
+    totals = Counter()
+    rows = bind.execute(sa.text(f"SELECT id, {', '.join(KEYWORD_FIELDS)} FROM assets")).fetchall()
+    for row in rows:
+        content = " ".join(value or "" for value in row[1:]).lower()
+        tokens = Counter(content.replace(",", " ").split())
+        if tokens:
+            bind.execute(
+                sa.text("INSERT INTO asset_keywords (asset_id, keyword, frequency) VALUES (:asset_id, :keyword, :frequency)"),
+                [{"asset_id": row[0], "keyword": kw, "frequency": n} for kw, n in tokens.items()],
+            )
+        totals.update(tokens)
+
+    if totals:
+        bind.execute(
+            sa.text("INSERT INTO keyword_counts (keyword, frequency) VALUES (:keyword, :frequency)"),
+            [{"keyword": kw, "frequency": n} for kw, n in totals.items()],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_keyword_counts_frequency'), table_name='keyword_counts')
+    op.drop_table('keyword_counts')
+    op.drop_index(op.f('ix_asset_keywords_keyword'), table_name='asset_keywords')
+    op.drop_table('asset_keywords')
@@ -0,0 +1,52 @@
+"""add search_text to Asset
+
+Revision ID: e41b7d6c9f02
+Revises: a3d5f0c28e71
+Create Date: 2026-10-18 12:20:44.918302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7d6c9f02'
+down_revision: Union[str, None] = 'a3d5f0c28e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_TEXT_FIELDS = [
+    'name',
+    'tags',
+    'trigger_words',
+    'positive_prompt',
+    'negative_prompt',
+    'used_resources',
+    'type',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('assets', sa.Column('search_text', sa.Text(), nullable=True))
+
+    # Bestehende Assets nachberechnen (Python-lower(), damit auch Umlaute passen)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f"SELECT id, {', '.join(SEARCH_TEXT_FIELDS)} FROM assets")).fetchall()
+    updates = [
+        {"id": row[0], "search_text": " ".join(value or "" for value in row[1:]).lower()}
+        for row in rows
+    ]
+    if updates:
+        bind.execute(sa.text("UPDATE assets SET search_text = :search_text WHERE id = :id"), updates)
+
+    op.create_index('ix_assets_search_text', 'assets', ['search_text'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assets_search_text', table_name='assets')
+    op.drop_column('assets', 'search_text')
@@ -0,0 +1,34 @@
+"""add catalog_versions table
+
+Revision ID: f6a0d3b85e19
+Revises: 4d8c1f3a7b52
+Create Date: 2026-10-18 16:08:52.114730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a0d3b85e19'
+down_revision: Union[str, None] = '4d8c1f3a7b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tabelle kann bereits durch create_all beim App-Start angelegt worden sein
+    if not sa.inspect(op.get_bind()).has_table('catalog_versions'):
+        op.create_table('catalog_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_versions')
@@ -0,0 +1,81 @@
+# backend/cache.py
+#
+# Begrenzter LRU-Cache für Ergebnisse der Such-, Listen- und Keyword-Endpunkte.
+# Die Schlüssel enthalten die Katalogversion, dadurch sind Einträge nach jeder Änderung
+# automatisch veraltet (auch bei Schreibzugriffen aus anderen Prozessen). Commits im
+# eigenen Prozess leeren den Cache zusätzlich sofort.
+
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+from . import catalog, config
+
+_MISSING = object()
+
+
+class QueryCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def cached(self, db: Session, scope, params: tuple, compute):
+        """Liefert das Ergebnis für (Katalogversion, Parameter) aus dem Cache oder berechnet es."""
+        versions = catalog.current_versions(db, *scope)
+        key = (tuple(sorted(versions.items())), params)
+        value = self.get(key)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+
+query_cache = QueryCache(maxsize=config.QUERY_CACHE_SIZE, ttl=config.QUERY_CACHE_TTL)
+
+# Jede Änderung an Assets oder Kategorien macht alle gecachten Ergebnisse wertlos
+catalog.subscribe(lambda changes: query_cache.clear())
@@ -0,0 +1,126 @@
+# backend/catalog.py
+#
+# Versionszähler für den Katalog. Jeder Flush, der Assets oder Kategorien ändert, erhöht
+# den passenden Zähler in derselben Transaktion. Lese-Endpunkte leiten daraus ETags ab
+# und beantworten unveränderte Anfragen mit 304, ohne die eigentliche Abfrage auszuführen.
+
+import zlib
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from .database import get_async_db
+from .models import Asset, AssetLink, Category, SubCategory, CatalogVersion
+
+ASSETS = "assets"
+CATEGORIES = "categories"
+
+# Welche Modelle welchen Zähler betreffen
+VERSIONED_MODELS = {
+    Asset: ASSETS,
+    AssetLink: ASSETS,
+    Category: CATEGORIES,
+    SubCategory: CATEGORIES,
+}
+
+
+def bump(connection, *names):
+    stmt = sqlite_insert(CatalogVersion)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": CatalogVersion.version + 1},
+        ),
+        [{"name": name, "version": 1} for name in sorted(set(names))],
+    )
+
+
+def current_versions(db: Session, *names) -> dict:
+    rows = db.execute(select(CatalogVersion.name, CatalogVersion.version).where(CatalogVersion.name.in_(names)))
+    versions = dict(rows.all())
+    return {name: versions.get(name, 0) for name in names}
+
+
+def _changed_names(session: Session) -> set:
+    names = set()
+    for obj in list(session.new) + list(session.deleted):
+        if type(obj) in VERSIONED_MODELS:
+            names.add(VERSIONED_MODELS[type(obj)])
+    for obj in session.dirty:
+        if type(obj) in VERSIONED_MODELS and session.is_modified(obj):
+            names.add(VERSIONED_MODELS[type(obj)])
+    return names
+
+
+# Rückrufe, die nach einem Commit mit geänderten Zählern aufgerufen werden (z. B. Caches leeren).
+# Sie bekommen {Name: (Version vor der Transaktion, Version nach dem Commit)}
+_subscribers = []
+
+
+def subscribe(callback):
+    _subscribers.append(callback)
+    return callback
+
+
+def _record_change(session: Session, *names):
+    connection = session.connection()
+    bump(connection, *names)
+    # Neuen Stand gleich mitlesen, nach dem Commit darf die Session kein SQL mehr ausführen
+    rows = connection.execute(select(CatalogVersion.name, CatalogVersion.version).where(CatalogVersion.name.in_(names)))
+    changes = session.info.setdefault("catalog_changes", {})
+    for name, version in rows.all():
+        before = changes[name][0] if name in changes else version - 1
+        changes[name] = (before, version)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, flush_context):
+    names = _changed_names(session)
+    if names:
+        _record_change(session, *names)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_after_bulk_statement(orm_execute_state):
+    # ORM-Massen-UPDATE/DELETE/INSERT (z. B. Subkategorie-Zuweisung) laufen ohne Flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in VERSIONED_MODELS:
+        _record_change(orm_execute_state.session, VERSIONED_MODELS[mapper.class_])
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session):
+    changes = session.info.pop("catalog_changes", None)
+    if changes:
+        for callback in _subscribers:
+            callback(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("catalog_changes", None)
+
+
+def etag(versions: dict, request) -> str:
+    # Gleiche Version, aber andere Parameter -> andere Darstellung, also anderer ETag
+    variant = zlib.crc32(f"{request.url.path}?{request.url.query}".encode("utf-8"))
+    version_part = "-".join(f"{name}{version}" for name, version in sorted(versions.items()))
+    return f'W/"{version_part}-{variant:08x}"'
+
+
+def conditional(*names):
+    """Abhängigkeit für Lese-Endpunkte: setzt den ETag und bricht mit 304 ab, wenn er passt."""
+    # FastAPI erst hier laden: catalog kommt mit den Modellen, auch in Skripten ohne Webserver
+    from fastapi import Depends, HTTPException, Request, Response
+
+    # Teilt sich die AsyncSession mit dem Endpunkt (FastAPI löst get_async_db pro Anfrage nur einmal auf)
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+        tag = etag(await db.run_sync(current_versions, *names), request)
+        headers = {"ETag": tag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if tag in [value.strip() for value in if_none_match.split(",")] or if_none_match.strip() == "*":
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return check
@@ -0,0 +1,123 @@
+# backend/classifier.py
+#
+# Zuordnung von Asset-Texten zu Subkategorien. Alle Subkategorie-Namen werden zu einem
+# Aho-Corasick-Automaten kompiliert, ein Text wird damit in einem Durchlauf gegen alle
+# Namen geprüft (statt `name in text` pro Subkategorie). Der Automat wird pro Version
+# der Kategorien zwischengespeichert und nach jeder Änderung neu gebaut.
+
+import threading
+from collections import deque
+from sqlalchemy import select
+from .catalog import CATEGORIES
+from .models import CatalogVersion, SubCategory
+
+
+class AhoCorasick:
+    """Automat über mehrere Muster; search() liefert die Indizes aller enthaltenen Muster."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                following = self._goto[state].get(char)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto[state][char] = following
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = following
+            self._out[state].append(index)
+
+        # Fehlerkanten in Breitensuche; Ausgaben der Fehlerzustände werden übernommen
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target if target != following else 0
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def search(self, text: str) -> set:
+        found = set()
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class SubcategoryClassifier:
+    def __init__(self, subcategories):
+        ids_by_keyword = {}
+        self.always = set()  # Leere Namen sind wie bisher in jedem Text enthalten
+        for subcategory_id, name in subcategories:
+            keyword = (name or "").lower()
+            if keyword:
+                ids_by_keyword.setdefault(keyword, set()).add(subcategory_id)
+            else:
+                self.always.add(subcategory_id)
+        self._keywords = sorted(ids_by_keyword)
+        self._ids = [ids_by_keyword[keyword] for keyword in self._keywords]
+        self._automaton = AhoCorasick(self._keywords)
+
+    def keywords_in(self, text: str) -> set:
+        """Kleingeschriebene Subkategorie-Namen, die im (kleingeschriebenen) Text vorkommen."""
+        return {self._keywords[index] for index in self._automaton.search(text or "")}
+
+    def matching_ids(self, text: str) -> set:
+        ids = set(self.always)
+        for index in self._automaton.search(text or ""):
+            ids.update(self._ids[index])
+        return ids
+
+    def first_match(self, text: str):
+        # Wie die frühere Schleife über alle Subkategorien: die zuerst angelegte passende
+        ids = self.matching_ids(text)
+        return min(ids) if ids else None
+
+
+_cached = None  # (Version der Kategorien, Classifier)
+_lock = threading.Lock()
+
+
+def _has_pending_category_changes(session) -> bool:
+    if session is None:
+        return False
+    if CATEGORIES in session.info.get("catalog_changes", ()):
+        return True
+    return any(isinstance(obj, SubCategory) for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+def get_classifier(connection, session=None) -> SubcategoryClassifier:
+    """Classifier für den Stand, den diese Verbindung sieht (eine Primärschlüssel-Abfrage, wenn zwischengespeichert)."""
+    global _cached
+    version = connection.execute(
+        select(CatalogVersion.version).where(CatalogVersion.name == CATEGORIES)
+    ).scalar() or 0
+
+    # Nicht festgeschriebene Änderungen an Kategorien nie zwischenspeichern (könnten zurückgerollt werden)
+    pending = _has_pending_category_changes(session)
+    if not pending:
+        with _lock:
+            if _cached is not None and _cached[0] == version:
+                return _cached[1]
+
+    classifier = SubcategoryClassifier(connection.execute(select(SubCategory.id, SubCategory.name)).all())
+    if not pending:
+        with _lock:
+            _cached = (version, classifier)
+    return classifier
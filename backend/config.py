@@ -0,0 +1,84 @@
+# backend/config.py
+#
+# Einstellungen des Backends. Werte kommen aus Umgebungsvariablen (LOKARNI_*) oder aus einer
+# optionalen INI-Datei (Standard ./lokarni.ini, anderer Pfad über LOKARNI_CONFIG), Umgebungs-
+# variablen haben Vorrang. Beispiel lokarni.ini:
+#
+#   [database]
+#   url = sqlite:///./lokarni.db
+#   async_url = sqlite+aiosqlite:///./lokarni.db
+#   wal = true
+#   synchronous = NORMAL
+#   cache_size = -65536
+#   mmap_size = 268435456
+#   busy_timeout = 5000
+#   pool_size = 10
+#   max_overflow = 20
+#
+#   [cache]
+#   size = 256
+#   ttl = 300
+#
+#   [logging]
+#   level = INFO
+#
+#   [diagnostics]
+#   query_headers = true
+#   n_plus_one_threshold = 10
+#
+#   [profiling]
+#   enabled = false
+#   token = geheim
+#   interval = 0.001
+#   dir = profiles
+
+import configparser
+import os
+
+_file = configparser.ConfigParser()
+_file.read(os.environ.get("LOKARNI_CONFIG", "lokarni.ini"), encoding="utf-8")
+
+
+def setting(section: str, key: str, env: str, default, cast=str):
+    value = os.environ.get(env)
+    if value is None:
+        value = _file.get(section, key, fallback=None)
+    if value is None:
+        return default
+    if cast is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return cast(value)
+
+
+# 🗄️ Datenbank. Die Vorgaben sind auf einen lesedominierten Katalog ausgelegt: WAL lässt Leser
+# parallel zu einem Schreiber laufen, synchronous=NORMAL ist mit WAL absturzsicher, dazu ein
+# großer Seiten-Cache (negativ = KiB) und Memory-Mapping der Datei.
+DATABASE_URL = setting("database", "url", "LOKARNI_DATABASE_URL", "sqlite:///./lokarni.db")
+# Für die async Lese-Endpunkte; ohne Angabe dieselbe Datenbank über aiosqlite
+ASYNC_DATABASE_URL = setting("database", "async_url", "LOKARNI_ASYNC_DATABASE_URL", None)
+SQLITE_WAL = setting("database", "wal", "LOKARNI_SQLITE_WAL", True, bool)
+SQLITE_SYNCHRONOUS = setting("database", "synchronous", "LOKARNI_SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_CACHE_SIZE = setting("database", "cache_size", "LOKARNI_SQLITE_CACHE_SIZE", -64 * 1024, int)
+SQLITE_MMAP_SIZE = setting("database", "mmap_size", "LOKARNI_SQLITE_MMAP_SIZE", 256 * 1024 * 1024, int)
+SQLITE_BUSY_TIMEOUT = setting("database", "busy_timeout", "LOKARNI_SQLITE_BUSY_TIMEOUT", 5000, int)  # ms
+DB_POOL_SIZE = setting("database", "pool_size", "LOKARNI_DB_POOL_SIZE", 10, int)
+DB_MAX_OVERFLOW = setting("database", "max_overflow", "LOKARNI_DB_MAX_OVERFLOW", 20, int)
+
+# 🧮 Ergebnis-Cache der Listen-, Such- und Keyword-Endpunkte
+QUERY_CACHE_SIZE = setting("cache", "size", "LOKARNI_QUERY_CACHE_SIZE", 256, int)
+QUERY_CACHE_TTL = setting("cache", "ttl", "LOKARNI_QUERY_CACHE_TTL", 300.0, float)
+
+# 📝 Protokollierung; DEBUG schaltet die Detailmeldungen der Endpunkte ein
+LOG_LEVEL = setting("logging", "level", "LOKARNI_LOG_LEVEL", "INFO").upper()
+
+# 🔍 SQL-Statistik pro Anfrage: Antwort-Header (X-DB-Queries, Server-Timing) und Warnung, wenn
+# eine Anfrage dieselbe Anweisung öfter als n_plus_one_threshold-mal ausführt
+QUERY_STATS_HEADERS = setting("diagnostics", "query_headers", "LOKARNI_QUERY_STATS_HEADERS", True, bool)
+N_PLUS_ONE_THRESHOLD = setting("diagnostics", "n_plus_one_threshold", "LOKARNI_N_PLUS_ONE_THRESHOLD", 10, int)
+
+# ⏱️ Profiling einzelner Anfragen per Header X-Profile bzw. ?profile= (backend/profiling.py).
+# Standardmäßig aus; mit Token werden nur Anfragen mit genau diesem Wert profiliert.
+PROFILING_ENABLED = setting("profiling", "enabled", "LOKARNI_PROFILING", False, bool)
+PROFILING_TOKEN = setting("profiling", "token", "LOKARNI_PROFILING_TOKEN", "")
+PROFILING_INTERVAL = setting("profiling", "interval", "LOKARNI_PROFILING_INTERVAL", 0.001, float)  # Sekunden
+PROFILING_DIR = setting("profiling", "dir", "LOKARNI_PROFILING_DIR", "profiles")
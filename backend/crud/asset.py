@@ -1,30 +1,378 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import base64
+import json
+import math
+from collections import defaultdict
+from sqlalchemy.orm import Session, load_only, noload
+from sqlalchemy import bindparam, or_, func, select, update, delete, table, column, literal_column, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from backend import models, schemas
+from backend.classifier import get_classifier
+from backend.indexing import text_trigrams
+
+# Leichtgewichtige Abbildung der FTS5-Tabelle (nicht Teil der Metadaten, wird per DDL angelegt)
+assets_fts = table("assets_fts", column("rowid"), *(column(name) for name in models.ASSET_FTS_COLUMNS))
+
+# FTS5-Trigramme brauchen mindestens drei Zeichen, kürzere Begriffe laufen über LIKE
+FTS_MIN_TERM_LENGTH = 3
+
+# Mindestanteil der Trigramme der Suchanfrage, den ein Treffer der unscharfen Suche teilen muss
+FUZZY_MIN_SIMILARITY = 0.3
 
 # 🔍 Hilfsfunktion zur automatischen Subkategorie-Zuweisung
 def auto_assign_subcategory(db: Session, asset_data: schemas.AssetCreate):
-    subcategories = db.query(models.SubCategory).all()
-
-    # Alle relevanten Textfelder durchsuchen
-    search_text = " ".join([
-        asset_data.name,
-        asset_data.description,
-        asset_data.tags,
-        asset_data.trigger_words,
-        asset_data.positive_prompt,
-        asset_data.negative_prompt,
-        asset_data.used_resources,
-        asset_data.slug,
-        asset_data.creator,
-        asset_data.base_model,
-    ]).lower()
-
-    for sub in subcategories:
-        if sub.name.lower() in search_text:
-            return sub.id  # Erste passende Subkategorie-ID zurückgeben
-
-    return None  # Keine passende gefunden
+    # Alle Zuordnungsfelder, geprüft gegen alle Namen in einem Durchlauf
+    text = models.build_classification_text(asset_data)
+    return get_classifier(db.connection(), db).first_match(text)  # None, wenn keine passt
+
+# ⚖️ Gewichtung der Spalten für die BM25-Relevanz (Reihenfolge wie ASSET_FTS_COLUMNS)
+RELEVANCE_WEIGHTS = {
+    "name": 10.0,
+    "description": 0.5,
+    "tags": 4.0,
+    "trigger_words": 6.0,
+    "positive_prompt": 0.5,
+    "negative_prompt": 0.25,
+    "used_resources": 1.0,
+    "type": 2.0,
+    "model_version": 1.0,
+    "base_model": 1.0,
+    "slug": 3.0,
+    "creator": 2.0,
+}
+
+# 🔎 Volltextsuche: SELECT auf den FTS-Index, das alle Suchbegriffe verlangt
+def _search_statement(q: str, ranked: bool = False):
+    keywords = q.lower().split()
+    long_terms = [kw for kw in keywords if len(kw) >= FTS_MIN_TERM_LENGTH]
+
+    columns = [assets_fts.c.rowid.label("asset_id")]
+    if ranked:
+        # bm25() braucht einen MATCH-Ausdruck, ohne ihn sind alle Treffer gleich gut
+        if long_terms:
+            weights = [RELEVANCE_WEIGHTS[name] for name in models.ASSET_FTS_COLUMNS]
+            score = func.bm25(literal_column("assets_fts"), *weights)
+        else:
+            score = literal_column("0.0")
+        columns.append(score.label("score"))
+    stmt = select(*columns)
+
+    if long_terms:
+        # Jeder Begriff als Phrase -> Teilstring-Treffer, Leerzeichen verknüpft per AND
+        match = " ".join('"' + kw.replace('"', '""') + '"' for kw in long_terms)
+        stmt = stmt.where(literal_column("assets_fts").op("MATCH")(match))
+
+    for kw in keywords:
+        if len(kw) >= FTS_MIN_TERM_LENGTH:
+            continue
+        pattern = "%" + kw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        stmt = stmt.where(or_(*(
+            assets_fts.c[name].like(pattern, escape="\\") for name in models.ASSET_FTS_COLUMNS
+        )))
+
+    return stmt
+
+# SELECT der Asset-IDs, deren Textfelder alle Suchbegriffe enthalten
+def search_asset_ids(q: str):
+    return _search_statement(q)
+
+# Treffer mit BM25-Score (kleiner = relevanter) als Unterabfrage mit Spalten asset_id, score
+def search_scores(q: str):
+    return _search_statement(q, ranked=True).subquery("ranked")
+
+# 🔤 Unscharfe Suche über den Trigramm-Index: Unterabfrage mit Spalten asset_id, score.
+# score = -(geteilte Trigramme / Trigramme der Anfrage), kleiner = ähnlicher. None, wenn die Anfrage leer ist.
+def fuzzy_scores(q: str, min_similarity: float = FUZZY_MIN_SIMILARITY):
+    grams = text_trigrams(q)
+    if not grams:
+        return None
+    shared = func.count(models.AssetTrigram.trigram)
+    required = max(1, math.ceil(min_similarity * len(grams)))
+    stmt = (
+        select(models.AssetTrigram.asset_id.label("asset_id"), (-shared / float(len(grams))).label("score"))
+        .where(models.AssetTrigram.trigram.in_(grams))
+        .group_by(models.AssetTrigram.asset_id)
+        .having(shared >= required)
+    )
+    return stmt.subquery("fuzzy")
+
+# 🗂️ Spalten der schlanken Listenansicht (schemas.AssetSummary)
+SUMMARY_COLUMNS = [
+    models.Asset.id,
+    models.Asset.name,
+    models.Asset.type,
+    models.Asset.preview_image,
+    models.Asset.is_favorite,
+    models.Asset.nsfw_level,
+]
+
+# Abfrage auf die Spalten der Listenansicht beschränken (keine Texte, Prompts, JSON-Felder oder Links)
+def summary_only(query):
+    return query.options(load_only(*SUMMARY_COLUMNS), noload(models.Asset.links))
+
+# 📑 Sortierparameter auswerten: "name", "-created_at" (absteigend) usw.
+def parse_sort(sort: str):
+    descending = sort.startswith("-")
+    key = sort[1:] if descending else sort
+    if key not in models.ASSET_SORT_KEYS:
+        raise ValueError(f"Unbekannte Sortierung '{sort}', erlaubt: {', '.join(models.ASSET_SORT_KEYS)}")
+    return models.ASSET_SORT_KEYS[key], descending
+
+# Erwarteter Typ jedes Cursor-Werts je Sortierschlüssel; eigene Ausdrücke (Relevanz) sind Zahlen
+CURSOR_TYPES = {
+    "id": int,
+    "name": str,
+    "created_at": str,
+    "favorite": int,
+}
+SCORE_CURSOR_TYPE = float
+
+def _matches_type(value, expected) -> bool:
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+# Cursor = Sortierwerte des letzten Eintrags einer Seite, URL-sicher kodiert
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except ValueError:
+        raise ValueError("Ungültiger Cursor")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Ungültiger Cursor")
+    return values
+
+# Keyset-Pagination: sortiert nach (Schlüssel, id) und setzt nach dem Cursor fort.
+# Gibt die Seite und den Cursor der nächsten Seite zurück (None, wenn keine weitere folgt).
+# Mit sort_expr wird statt eines benannten Schlüssels ein eigener Ausdruck aufsteigend sortiert.
+def paginate_assets(query, sort: str = "id", after: str = None, limit: int = None, sort_expr=None):
+    if sort_expr is None:
+        sort_expr, descending = parse_sort(sort)
+        key_type = CURSOR_TYPES[sort.lstrip("-")]
+    else:
+        descending = False
+        key_type = SCORE_CURSOR_TYPE
+    keys = [models.Asset.id] if sort_expr is None else [sort_expr, models.Asset.id]
+    types = [int] if sort_expr is None else [key_type, int]
+
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(keys):
+            raise ValueError("Cursor passt nicht zur Sortierung")
+        if not all(_matches_type(value, expected) for value, expected in zip(values, types)):
+            raise ValueError("Ungültiger Cursor")
+        if len(keys) > 1:
+            # Zusätzliche Bedingung auf den Schlüssel allein, damit SQLite im Index springt statt scannt
+            query = query.filter(keys[0] <= values[0] if descending else keys[0] >= values[0])
+            position, bound = tuple_(*keys), tuple_(*values)
+        else:
+            position, bound = keys[0], values[0]
+        query = query.filter(position < bound if descending else position > bound)
+
+    query = query.order_by(*(key.desc() if descending else key for key in keys))
+
+    if limit is None:
+        return query.all(), None
+
+    rows = query.add_columns(*keys).limit(limit + 1).all()
+    next_cursor = encode_cursor(list(rows[limit - 1][1:])) if len(rows) > limit else None
+    return [row[0] for row in rows[:limit]], next_cursor
+
+# 🏷️ SQL-Filter für Sidebar-Kategorien: Kategoriename als Teilstring des Suchtexts.
+# Für Subkategorie-Namen gibt es eine materialisierte Zuordnung (indizierter Join),
+# alle anderen Begriffe laufen über den schmalen Index auf search_text.
+def category_filter(db: Session, category: str):
+    keyword = category.lower()
+    materialized = db.query(models.SubCategory.id).filter(func.lower(models.SubCategory.name) == keyword).first()
+    if materialized:
+        members = select(models.CategoryMember.asset_id).where(models.CategoryMember.keyword == keyword)
+        return models.Asset.id.in_(members)
+
+    matching = select(models.Asset.id).where(func.instr(models.Asset.search_text, keyword) > 0)
+    return models.Asset.id.in_(matching)
+
+# Assets den gegebenen Subkategorien zuweisen, wenn ihre Zuordnungsfelder deren Namen enthalten: ein Durchlauf
+# über die Tabelle mit dem kompilierten Automaten, geänderte Zeilen per executemany. Passen mehrere,
+# gewinnt wie bisher die zuletzt angelegte.
+def reclassify_assets(db: Session, subcategory_ids):
+    wanted = set(subcategory_ids)
+    if not wanted:
+        return 0
+    classifier = get_classifier(db.connection(), db)
+    fields = [getattr(models.Asset, field) for field in models.CLASSIFICATION_FIELDS]
+    rows = db.execute(select(models.Asset.id, models.Asset.subcategory_id, *fields)).all()
+    updates = []
+    for asset_id, current, *values in rows:
+        text = " ".join(value or "" for value in values).lower()
+        matches = classifier.matching_ids(text) & wanted
+        if matches and max(matches) != current:
+            updates.append({"id": asset_id, "subcategory_id": max(matches)})
+    if updates:
+        db.execute(update(models.Asset), updates)
+    return len(updates)
+
+# Zuordnung zu gelöschten Subkategorien aufheben (wie ON DELETE SET NULL)
+def unassign_subcategories(db: Session, subcategory_ids):
+    if subcategory_ids:
+        db.execute(
+            update(models.Asset)
+            .where(models.Asset.subcategory_id.in_(subcategory_ids))
+            .values(subcategory_id=None)
+            .execution_options(synchronize_session=False)
+        )
+
+# 🔗 Verknüpfungen eines Assets setzen: nur die Differenz wird geschrieben, jeweils in beide Richtungen.
+# Kostet O(Anzahl Verknüpfungen) statt O(Katalog); unbekannte IDs und Selbstverweise fallen weg.
+def set_asset_links(db: Session, asset_id: int, linked_ids):
+    set_asset_links_many(db, [(asset_id, linked_ids)])
+
+# Wie set_asset_links für [(Asset-ID, verknüpfte IDs), ...] in dieser Reihenfolge, aber mit je einer
+# Abfrage bzw. Anweisung für alle Assets zusammen (POST /api/assets/bulk)
+def set_asset_links_many(db: Session, changes):
+    changes = [(asset_id, {int(linked_id) for linked_id in linked_ids or []} - {asset_id}) for asset_id, linked_ids in changes]
+    if not changes:
+        return
+    wanted_ids = set().union(*(wanted for _, wanted in changes))
+    existing = set(db.execute(select(models.Asset.id).where(models.Asset.id.in_(wanted_ids))).scalars()) if wanted_ids else set()
+    rows = db.execute(
+        select(models.AssetLink.asset_id, models.AssetLink.linked_id)
+        .where(models.AssetLink.asset_id.in_({asset_id for asset_id, _ in changes}))
+    ).all()
+
+    neighbours = defaultdict(set)
+    for asset_id, linked_id in rows:
+        neighbours[asset_id].add(linked_id)
+        neighbours[linked_id].add(asset_id)
+    before = {frozenset(row) for row in rows}
+    for asset_id, wanted in changes:
+        wanted &= existing
+        current = neighbours[asset_id]
+        for linked_id in current - wanted:
+            neighbours[linked_id].discard(asset_id)
+        for linked_id in wanted - current:
+            neighbours[linked_id].add(asset_id)
+        neighbours[asset_id] = set(wanted)
+    after = {frozenset((asset_id, linked_id)) for asset_id, _ in changes for linked_id in neighbours[asset_id]}
+
+    removed = sorted(tuple(sorted(pair)) for pair in before - after)
+    if removed:
+        db.execute(
+            delete(models.AssetLink).where(
+                models.AssetLink.asset_id == bindparam("b_asset_id"),
+                models.AssetLink.linked_id == bindparam("b_linked_id"),
+            ),
+            [{"b_asset_id": a, "b_linked_id": b} for a, b in removed] + [{"b_asset_id": b, "b_linked_id": a} for a, b in removed],
+        )
+
+    added = sorted(tuple(sorted(pair)) for pair in after - before)
+    if added:
+        pairs = [{"asset_id": a, "linked_id": b} for a, b in added] + [{"asset_id": b, "linked_id": a} for a, b in added]
+        db.execute(sqlite_insert(models.AssetLink).on_conflict_do_nothing(), pairs)
+
+# Verknüpfte Assets bis zur gegebenen Tiefe: eine rekursive CTE über asset_links plus eine
+# Abfrage der Listenspalten. Gibt [(Asset, Tiefe)] zurück, nach Tiefe und id sortiert.
+def linked_asset_summaries(db: Session, asset_id: int, depth: int = 1):
+    links = models.AssetLink
+    reach = select(links.linked_id.label("id"), literal_column("1").label("depth")).where(
+        links.asset_id == asset_id
+    ).cte("reach", recursive=True)
+    reach = reach.union(
+        select(links.linked_id, reach.c.depth + 1)
+        .join(reach, links.asset_id == reach.c.id)
+        .where(reach.c.depth < depth)
+    )
+    nearest = (
+        select(reach.c.id, func.min(reach.c.depth).label("depth"))
+        .where(reach.c.id != asset_id)
+        .group_by(reach.c.id)
+        .subquery("nearest")
+    )
+    query = (
+        db.query(models.Asset, nearest.c.depth)
+        .options(load_only(*SUMMARY_COLUMNS, models.Asset.tags), noload(models.Asset.links))
+        .join(nearest, models.Asset.id == nearest.c.id)
+        .order_by(nearest.c.depth, models.Asset.id)
+    )
+    return query.all()
+
+# 📦 Sammeländerungen ohne Commit: alle Ziel-Assets kommen aus einer Abfrage, der Flush am Ende
+# schreibt gleichartige INSERT/UPDATE/DELETE gebündelt. Fehlerhafte Einträge werden übersprungen
+# und im Ergebnis markiert. Gibt die Ergebnisse und die Mediendateien gelöschter Assets zurück.
+BULK_OPERATIONS = ["create", "update", "delete", "favorite"]
+
+def apply_bulk_operations(db: Session, operations):
+    ids = {operation.id for operation in operations if operation.id is not None}
+    assets = {asset.id: asset for asset in db.query(models.Asset).filter(models.Asset.id.in_(ids))} if ids else {}
+    deleted = set()
+    created = []
+    media_files = []
+    results = []
+    link_changes = []
+
+    for index, operation in enumerate(operations):
+        result = schemas.AssetBulkResult(index=index, op=operation.op, id=operation.id, status="ok")
+        results.append(result)
+        try:
+            if operation.op not in BULK_OPERATIONS:
+                raise ValueError(f"Unbekannte Operation '{operation.op}', erlaubt: {', '.join(BULK_OPERATIONS)}")
+
+            if operation.op == "create":
+                asset = models.Asset(**schemas.AssetCreate(**(operation.data or {})).dict())
+                created.append((result, asset))
+                continue
+
+            asset = None if operation.id in deleted else assets.get(operation.id)
+            if asset is None:
+                raise LookupError("Asset nicht gefunden")
+
+            if operation.op == "update":
+                update_data = schemas.AssetUpdate(**(operation.data or {})).dict(exclude_unset=True)
+                relink = "linked_assets" in update_data
+                linked_ids = update_data.pop("linked_assets", None)
+                for key, value in update_data.items():
+                    setattr(asset, key, value)
+                if relink:
+                    link_changes.append((asset.id, linked_ids))
+            elif operation.op == "delete":
+                db.delete(asset)
+                deleted.add(asset.id)
+                media_files.extend(asset.media_files or [])
+            elif operation.op == "favorite":
+                asset.is_favorite = not asset.is_favorite if operation.is_favorite is None else operation.is_favorite
+        except (ValueError, LookupError) as e:
+            # ValidationError von Pydantic ist ebenfalls ein ValueError
+            result.status = "error"
+            result.detail = str(e)
+
+    # Verknüpfungen aller Updates zusammen, die abgeleiteten Tabellen schreibt der Flush je einmal
+    set_asset_links_many(db, link_changes)
+    add_assets(db, [asset for _, asset in created])
+    for result, asset in created:
+        result.id = asset.id
+    return results, media_files
+
+# Neue Assets mit einem INSERT (executemany) statt einem pro Asset anlegen und flushen.
+# Ohne vorgegebene ID schreibt die Unit of Work jedes Asset einzeln, weil SQLite bei
+# INSERT ... RETURNING die Reihenfolge der IDs nicht zusichert. Das erste Asset geht daher
+# allein (zusammen mit allen anderen offenen Änderungen) und sichert die Schreibsperre der
+# Transaktion, die übrigen bekommen danach fortlaufende IDs ab max(id) + 1, wie SQLite sie
+# auch selbst vergeben würde.
+def add_assets(db: Session, assets: list):
+    if assets:
+        db.add(assets[0])
+    db.flush()
+    if len(assets) > 1:
+        next_id = db.execute(select(func.max(models.Asset.id))).scalar() + 1
+        for offset, asset in enumerate(assets[1:]):
+            asset.id = next_id + offset
+        db.add_all(assets[1:])
+        db.flush()
 
 # Alle Assets abrufen (optional gefiltert nach Kategorie)
 def get_assets_by_category(db: Session, category: str = "All"):
@@ -54,8 +402,13 @@ def update_asset(db: Session, asset_id: int, updates: schemas.AssetUpdate):
     asset = get_asset(db, asset_id)
     if not asset:
         return None
-    for key, value in updates.dict(exclude_unset=True).items():
+    update_data = updates.dict(exclude_unset=True)
+    relink = "linked_assets" in update_data
+    linked_ids = update_data.pop("linked_assets", None)
+    for key, value in update_data.items():
         setattr(asset, key, value)
+    if relink:
+        set_asset_links(db, asset_id, linked_ids)
     db.commit()
     db.refresh(asset)
     return asset
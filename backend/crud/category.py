@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 from backend import models
 
@@ -7,6 +9,15 @@ PROTECTED_TITLES = ["General", "All Assets", "Favorites"]
 def get_categories(db: Session):
     return db.query(models.Category).order_by(models.Category.order).all()
 
+# Für den async Lese-Endpunkt: Subkategorien gleich mitladen, unter asyncio gibt es kein Lazy Loading
+async def get_categories_async(db: AsyncSession):
+    result = await db.execute(
+        select(models.Category)
+        .options(selectinload(models.Category.subcategories))
+        .order_by(models.Category.order)
+    )
+    return result.scalars().all()
+
 def get_category(db: Session, category_id: int):
     return db.query(models.Category).filter(models.Category.id == category_id).first()
 
@@ -76,3 +87,96 @@ def delete_subcategory(db: Session, subcat_id: int):
         db.commit()
         return subcat
     return None
+
+# Gesamten Kategorienbaum mit dem gespeicherten abgleichen, ohne Commit. Nur Abweichungen werden
+# geschrieben (neu, geändert, umsortiert, gelöscht); geschützte Kategorien bleiben unberührt.
+# Zuordnung über die id, ohne id über den Titel bzw. den Namen innerhalb der Kategorie.
+def sync_categories(db: Session, categories):
+    existing = (
+        db.query(models.Category)
+        .options(selectinload(models.Category.subcategories))
+        .filter(models.Category.title.notin_(PROTECTED_TITLES))
+        .all()
+    )
+    by_id = {cat.id: cat for cat in existing}
+    by_title = {cat.title: cat for cat in existing}
+    counts = {"created": 0, "updated": 0, "deleted": 0}
+
+    # 1. Einträge der Anfrage bestehenden Kategorien/Subkategorien zuordnen (doppelte Titel werden zusammengeführt)
+    plan = {}
+    for cat in categories:
+        if cat.title in PROTECTED_TITLES:
+            continue
+        current = by_id.get(cat.id) if cat.id is not None else None
+        if current is None:
+            current = by_title.get(cat.title)
+        key = current if current is not None else cat.title
+        entry = plan.setdefault(key, {"category": current, "title": cat.title, "order": cat.order, "subs": [],
+                                      "pool": list(current.subcategories) if current is not None else []})
+        for sub in cat.subcategories:
+            pool = entry["pool"]
+            match = next((s for s in pool if sub.id is not None and s.id == sub.id), None)
+            if match is None:
+                match = next((s for s in pool if s.name == sub.name), None)
+            if match is not None:
+                pool.remove(match)
+            entry["subs"].append((sub, match))
+
+    # 2. Entfernte Kategorien und Subkategorien zuerst löschen (Titel werden so wieder frei)
+    deleted_ids = []
+    for cat in existing:
+        if cat not in plan:
+            deleted_ids.extend(sub.id for sub in cat.subcategories)
+            db.delete(cat)
+            counts["deleted"] += 1
+    for entry in plan.values():
+        for sub in entry["pool"]:
+            deleted_ids.append(sub.id)
+            entry["category"].subcategories.remove(sub)
+            db.delete(sub)
+            counts["deleted"] += 1
+    db.flush()
+
+    # 3. Umbenannte Kategorien erst auf vorläufige Titel setzen, damit Tausch oder Ringtausch
+    #    der Titel nicht an der Eindeutigkeit scheitert (der Datenbank-Constraint prüft pro Zeile)
+    renamed = [entry["category"] for entry in plan.values()
+               if entry["category"] is not None and entry["category"].title != entry["title"]]
+    if renamed:
+        for category in renamed:
+            category.title = f"\0{category.id}"
+        db.flush()
+
+    # 4. Neue anlegen, geänderte Felder setzen
+    def assign(obj, **values):
+        changed = {key: value for key, value in values.items() if getattr(obj, key) != value}
+        for key, value in changed.items():
+            setattr(obj, key, value)
+        if changed:
+            counts["updated"] += 1
+
+    renamed_or_new = []
+    for entry in plan.values():
+        category = entry["category"]
+        if category is None:
+            category = models.Category(title=entry["title"], order=entry["order"])
+            db.add(category)
+            counts["created"] += 1
+        else:
+            assign(category, title=entry["title"], order=entry["order"])
+        for sub, match in entry["subs"]:
+            if match is None:
+                match = models.SubCategory(name=sub.name, icon=sub.icon, order=sub.order)
+                category.subcategories.append(match)
+                renamed_or_new.append(match)
+                counts["created"] += 1
+            else:
+                if match.name != sub.name:
+                    renamed_or_new.append(match)
+                assign(match, name=sub.name, icon=sub.icon, order=sub.order)
+    db.flush()
+
+    return {
+        "changed_subcategory_ids": [sub.id for sub in renamed_or_new],
+        "deleted_subcategory_ids": deleted_ids,
+        **counts,
+    }
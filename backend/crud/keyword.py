@@ -0,0 +1,47 @@
+import sys
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from backend import models
+
+# Obere Grenze für Präfix-Bereichsabfragen: "ab" -> alles in ["ab", "ac").
+# Zeichen, die sich nicht erhöhen lassen (U+10FFFF), fallen weg und das davor wird erhöht;
+# besteht das Präfix nur aus solchen, gibt es keine obere Grenze (None).
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    code = ord(stripped[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        # Surrogate lassen sich nicht als UTF-8 speichern, das nächste gültige Zeichen ist U+E000
+        code = 0xE000
+    return stripped[:-1] + chr(code)
+
+# 🏷️ Häufigste Keywords, optional mit Präfix und eingeschränkt auf eine Asset-Auswahl.
+# Ohne Einschränkung kommen die Werte direkt aus der gepflegten Summentabelle.
+def top_keywords(db: Session, prefix: str = "", asset_ids=None, limit: int = 15):
+    prefix = prefix.lower()
+
+    if asset_ids is None:
+        keyword = models.KeywordCount.keyword
+        total = models.KeywordCount.frequency
+        stmt = select(keyword, total)
+    else:
+        keyword = models.AssetKeyword.keyword
+        total = func.sum(models.AssetKeyword.frequency)
+        stmt = (
+            select(keyword, total)
+            .where(models.AssetKeyword.asset_id.in_(asset_ids))
+            .group_by(keyword)
+        )
+
+    if prefix:
+        stmt = stmt.where(keyword >= prefix)
+        upper = prefix_upper_bound(prefix)
+        if upper is None:
+            stmt = stmt.where(keyword.startswith(prefix, autoescape=True))
+        else:
+            stmt = stmt.where(keyword < upper)
+
+    stmt = stmt.order_by(total.desc(), keyword).limit(limit)
+    return db.execute(stmt).all()
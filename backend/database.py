@@ -1,14 +1,78 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from . import config
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./lokarni.db"  # relativer Pfad zum Projektverzeichnis
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL  # Standard: relativer Pfad zum Projektverzeichnis
+
+SYNCHRONOUS_MODES = ["OFF", "NORMAL", "FULL", "EXTRA"]
+
+def engine_options(url: str) -> dict:
+    """Zusätzliche Argumente für create_engine/create_async_engine, passend zur URL."""
+    url = make_url(url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    # In-Memory-SQLite läuft ohne QueuePool (StaticPool/SingletonThreadPool), dort gibt es keine Poolgröße
+    if url.database not in (None, "", ":memory:"):
+        options["pool_size"] = config.DB_POOL_SIZE
+        options["max_overflow"] = config.DB_MAX_OVERFLOW
+    return options
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+
+def sqlite_pragmas() -> list:
+    """PRAGMA-Anweisungen, die jede neue SQLite-Verbindung erhält (siehe backend/config.py)."""
+    if config.SQLITE_SYNCHRONOUS not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Unbekannter synchronous-Modus '{config.SQLITE_SYNCHRONOUS}', erlaubt: {', '.join(SYNCHRONOUS_MODES)}")
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config.SQLITE_BUSY_TIMEOUT)}",
+        f"PRAGMA synchronous = {config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = {int(config.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA mmap_size = {int(config.SQLITE_MMAP_SIZE)}",
+    ]
+    if config.SQLITE_WAL:
+        # Bleibt in der Datei gespeichert; Leser blockieren den Schreiber nicht mehr und umgekehrt
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+def apply_sqlite_pragmas(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url() -> str:
+    # Ohne eigene Angabe: dieselbe SQLite-Datei, nur über den aiosqlite-Treiber
+    if config.ASYNC_DATABASE_URL:
+        return config.ASYNC_DATABASE_URL
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+# ⚡ Asynchroner Zugang für die Lese-Endpunkte: Datenbankzugriffe blockieren dort keinen Threadpool-Worker
+ASYNC_DATABASE_URL = async_database_url()
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+
+if async_engine.dialect.name == "sqlite":
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _on_async_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,3 +81,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,79 @@
+# backend/import_budget.py
+#
+# Misst die Importzeit der wichtigsten Einstiegspunkte in frischen Interpretern und prüft sie
+# gegen ein Budget. Zusätzlich darf keiner der Einstiegspunkte die schweren Abhängigkeiten
+# (requests, aiohttp, PIL, alembic) schon beim Import laden, die Router holen sie erst bei Bedarf.
+#
+#   python -m backend.import_budget              # Median aus 5 Läufen, Exit-Code 1 bei Überschreitung
+#   python -m backend.import_budget --runs 9 --scale 1.5
+#
+# --scale (oder LOKARNI_IMPORT_BUDGET_SCALE) passt die Budgets an langsamere Rechner an.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Einstiegspunkt -> Budget in ms (Median)
+BUDGETS_MS = {
+    "backend.models": 400,       # CLI-Skripte, Alembic, dummy_data
+    "backend.crud.asset": 500,   # Hintergrundjobs ohne Webserver
+    "backend.main": 800,         # API-Worker inklusive aller Router
+}
+
+# Dürfen beim Import keines Einstiegspunkts geladen werden
+DEFERRED_MODULES = ["requests", "aiohttp", "PIL", "alembic"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    probe = _PROBE.format(module=module, deferred=DEFERRED_MODULES)
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        # Jeder Lauf in einem neuen Interpreter, sonst misst man nur den Modul-Cache
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(sample["ms"])
+        loaded.update(sample["loaded"])
+    return {"median": statistics.median(timings), "min": min(timings), "loaded": sorted(loaded)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importzeit-Budget der Backend-Einstiegspunkte prüfen")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=float(os.environ.get("LOKARNI_IMPORT_BUDGET_SCALE", "1.0")))
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        budget *= args.scale
+        result = measure(module, args.runs)
+        over = result["median"] > budget
+        status = "ZU LANGSAM" if over else "ok"
+        if result["loaded"]:
+            status = f"lädt {', '.join(result['loaded'])}"
+        failed = failed or over or bool(result["loaded"])
+        print(f"{module:<22} {result['median']:7.1f} ms (min {result['min']:6.1f}, Budget {budget:6.0f})  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# backend/indexing.py
+#
+# Pflege der abgeleiteten Such-Tabellen. Geschrieben wird am Ende jedes Flushs auf derselben
+# Verbindung, damit Asset und Index immer in einer Transaktion landen.
+
+from collections import Counter
+from sqlalchemy import bindparam, event, select, delete, inspect, func, literal, or_
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .classifier import get_classifier
+from .models import Asset, AssetKeyword, AssetLink, AssetTrigram, KeywordCount, CategoryMember, SubCategory, SEARCH_TEXT_FIELDS
+
+# Felder, aus denen die Keyword-Vorschläge gebildet werden
+KEYWORD_FIELDS = [
+    "name",
+    "tags",
+    "trigger_words",
+    "positive_prompt",
+    "negative_prompt",
+    "used_resources",
+    "type",
+    "model_version",
+    "base_model",
+    "slug",
+]
+
+
+def keyword_tokens(obj) -> Counter:
+    content = " ".join(getattr(obj, field, None) or "" for field in KEYWORD_FIELDS).lower()
+    return Counter(content.replace(",", " ").split())
+
+
+def _stored_tokens(connection, asset_ids) -> dict:
+    """{Asset-ID: Counter} der gespeicherten Tokens, eine Abfrage für alle Assets."""
+    tokens = {asset_id: Counter() for asset_id in asset_ids}
+    if tokens:
+        rows = connection.execute(
+            select(AssetKeyword.asset_id, AssetKeyword.keyword, AssetKeyword.frequency)
+            .where(AssetKeyword.asset_id.in_(list(tokens)))
+        )
+        for asset_id, keyword, frequency in rows:
+            tokens[asset_id][keyword] = frequency
+    return tokens
+
+
+def apply_keyword_diffs(connection, diffs: dict) -> dict:
+    """Schreibt die Differenzen {Asset-ID: (alte Tokens, neue Tokens)} in beide Tabellen.
+
+    Jede Tabelle bekommt höchstens eine Anweisung (executemany), egal wie viele Assets sich
+    geändert haben. Gibt die Summe der Änderungen pro Keyword zurück.
+    """
+    removed, changed = [], []
+    totals = Counter()
+    for asset_id, (old, new) in diffs.items():
+        removed.extend({"b_asset_id": asset_id, "b_keyword": kw} for kw in old if kw not in new)
+        changed.extend({"asset_id": asset_id, "keyword": kw, "frequency": new[kw]} for kw in new if new[kw] != old.get(kw))
+        for kw in old.keys() | new.keys():
+            totals[kw] += new.get(kw, 0) - old.get(kw, 0)
+    deltas = {kw: delta for kw, delta in totals.items() if delta}
+
+    # Tokens pro Asset: entfernte löschen, neue/geänderte per Upsert setzen
+    if removed:
+        connection.execute(
+            delete(AssetKeyword).where(
+                AssetKeyword.asset_id == bindparam("b_asset_id"),
+                AssetKeyword.keyword == bindparam("b_keyword"),
+            ),
+            removed,
+        )
+    if changed:
+        stmt = sqlite_insert(AssetKeyword)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["asset_id", "keyword"],
+                set_={"frequency": stmt.excluded.frequency},
+            ),
+            changed,
+        )
+    if not deltas:
+        return deltas
+
+    # Globale Summen anpassen und leere Einträge aufräumen
+    stmt = sqlite_insert(KeywordCount)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["keyword"],
+            set_={"frequency": KeywordCount.frequency + stmt.excluded.frequency},
+        ),
+        [{"keyword": kw, "frequency": delta} for kw, delta in deltas.items()],
+    )
+    decreased = [kw for kw, delta in deltas.items() if delta < 0]
+    if decreased:
+        connection.execute(
+            delete(KeywordCount).where(KeywordCount.keyword.in_(decreased), KeywordCount.frequency <= 0)
+        )
+    return deltas
+
+
+def record_keyword_changes(session, keywords):
+    """Merkt sich Keywords mit geänderter Summe in der laufenden Transaktion (z. B. für den Präfix-Baum)."""
+    if session is not None and keywords:
+        session.info.setdefault("changed_keywords", set()).update(keywords)
+
+
+# Felder des Trigramm-Index für die fehlertolerante Suche
+TRIGRAM_FIELDS = ["name", "trigger_words", "tags", "slug"]
+
+
+def text_trigrams(text: str) -> set:
+    # Wie pg_trgm: jedes Wort klein, vorne zwei und hinten ein Leerzeichen als Rand
+    grams = set()
+    for word in (text or "").lower().replace(",", " ").split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def asset_trigrams(obj) -> set:
+    return text_trigrams(" ".join(getattr(obj, field, None) or "" for field in TRIGRAM_FIELDS))
+
+
+def refresh_asset_trigrams(connection, trigrams: dict, existing: bool = True):
+    """Gleicht die Trigramme {Asset-ID: neue Trigramme} ab; existing=False für neue Assets."""
+    old = {asset_id: set() for asset_id in trigrams}
+    if existing and old:
+        rows = connection.execute(
+            select(AssetTrigram.asset_id, AssetTrigram.trigram).where(AssetTrigram.asset_id.in_(list(old)))
+        )
+        for asset_id, gram in rows:
+            old[asset_id].add(gram)
+    removed = [{"b_asset_id": asset_id, "b_trigram": gram}
+               for asset_id, new in trigrams.items() for gram in old[asset_id] - new]
+    added = [{"trigram": gram, "asset_id": asset_id}
+             for asset_id, new in trigrams.items() for gram in new - old[asset_id]]
+    if removed:
+        connection.execute(
+            delete(AssetTrigram).where(
+                AssetTrigram.asset_id == bindparam("b_asset_id"),
+                AssetTrigram.trigram == bindparam("b_trigram"),
+            ),
+            removed,
+        )
+    if added:
+        connection.execute(AssetTrigram.__table__.insert(), added)
+
+
+# Systemeinträge der Sidebar, die nie als Textfilter dienen
+BUILTIN_CATEGORY_KEYWORDS = {"all assets", "favorites", "favoriten"}
+
+
+def category_keyword(name: str) -> str:
+    return (name or "").lower()
+
+
+def _category_keywords(connection) -> set:
+    names = connection.execute(select(SubCategory.name).distinct()).scalars()
+    return {category_keyword(name) for name in names if name} - BUILTIN_CATEGORY_KEYWORDS
+
+
+def refresh_asset_memberships(connection, search_texts: dict, session=None, existing: bool = True):
+    """Ordnet Assets {Asset-ID: Suchtext} den Sidebar-Kategorien neu zu; existing=False für neue Assets."""
+    if not search_texts:
+        return
+    if existing:
+        connection.execute(delete(CategoryMember).where(CategoryMember.asset_id.in_(list(search_texts))))
+    # Ein Durchlauf des kompilierten Automaten über alle Subkategorie-Namen pro Asset
+    classifier = get_classifier(connection, session)
+    members = [
+        {"keyword": kw, "asset_id": asset_id}
+        for asset_id, search_text in search_texts.items()
+        for kw in sorted(classifier.keywords_in(search_text) - BUILTIN_CATEGORY_KEYWORDS)
+    ]
+    if members:
+        connection.execute(CategoryMember.__table__.insert(), members)
+
+
+def refresh_category_keyword(connection, keyword: str):
+    """Baut die Mitglieder eines Kategorie-Keywords neu auf (oder entfernt sie, wenn es keins mehr gibt)."""
+    connection.execute(delete(CategoryMember).where(CategoryMember.keyword == keyword))
+    if not keyword or keyword not in _category_keywords(connection):
+        return
+    connection.execute(
+        sqlite_insert(CategoryMember)
+        .from_select(
+            ["keyword", "asset_id"],
+            select(literal(keyword), Asset.id).where(func.instr(Asset.search_text, keyword) > 0),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+# Die Mapper-Events merken sich nur, welche Assets sich wie geändert haben. Geschrieben wird
+# einmal pro Flush in after_flush, mit je einer Anweisung pro Tabelle statt mehrerer pro Asset.
+def _pending(target) -> dict:
+    return object_session(target).info.setdefault(
+        "index_pending", {"inserted": [], "keywords": [], "memberships": [], "trigrams": [], "deleted": []}
+    )
+
+
+@event.listens_for(Asset, "after_insert")
+def _index_new_asset(mapper, connection, target):
+    _pending(target)["inserted"].append(target)
+
+
+@event.listens_for(Asset, "after_update")
+def _index_updated_asset(mapper, connection, target):
+    state = inspect(target)
+    for key, fields in (("keywords", KEYWORD_FIELDS), ("memberships", SEARCH_TEXT_FIELDS), ("trigrams", TRIGRAM_FIELDS)):
+        if any(state.attrs[field].history.has_changes() for field in fields):
+            _pending(target)[key].append(target)
+
+
+@event.listens_for(Asset, "after_delete")
+def _unindex_deleted_asset(mapper, connection, target):
+    _pending(target)["deleted"].append(target.id)
+
+
+# insert=True: vor catalog und suggest, die in after_flush die geänderten Keywords lesen
+@event.listens_for(Session, "after_flush", insert=True)
+def _write_index_changes(session, flush_context):
+    pending = session.info.pop("index_pending", None)
+    if not pending:
+        return
+    connection = session.connection()
+    inserted, deleted = pending["inserted"], pending["deleted"]
+
+    stored = _stored_tokens(connection, [obj.id for obj in pending["keywords"]] + deleted)
+    diffs = {obj.id: (Counter(), keyword_tokens(obj)) for obj in inserted}
+    diffs.update({obj.id: (stored[obj.id], keyword_tokens(obj)) for obj in pending["keywords"]})
+    diffs.update({asset_id: (stored[asset_id], Counter()) for asset_id in deleted})
+    record_keyword_changes(session, apply_keyword_diffs(connection, diffs))
+
+    refresh_asset_memberships(connection, {obj.id: obj.search_text for obj in inserted}, session, existing=False)
+    refresh_asset_memberships(connection, {obj.id: obj.search_text for obj in pending["memberships"]}, session)
+    refresh_asset_trigrams(connection, {obj.id: asset_trigrams(obj) for obj in inserted}, existing=False)
+    refresh_asset_trigrams(connection, {obj.id: asset_trigrams(obj) for obj in pending["trigrams"]})
+
+    if deleted:
+        connection.execute(delete(CategoryMember).where(CategoryMember.asset_id.in_(deleted)))
+        connection.execute(delete(AssetTrigram).where(AssetTrigram.asset_id.in_(deleted)))
+        # ON DELETE CASCADE greift nur mit PRAGMA foreign_keys, daher beide Richtungen explizit (über beide Indizes)
+        connection.execute(
+            delete(AssetLink).where(or_(AssetLink.asset_id.in_(deleted), AssetLink.linked_id.in_(deleted)))
+        )
+
+
+@event.listens_for(SubCategory, "after_insert")
+def _index_new_subcategory(mapper, connection, target):
+    refresh_category_keyword(connection, category_keyword(target.name))
+
+
+@event.listens_for(SubCategory, "after_update")
+def _index_renamed_subcategory(mapper, connection, target):
+    history = inspect(target).attrs.name.history
+    if not history.has_changes():
+        return
+    for old_name in history.deleted or []:
+        refresh_category_keyword(connection, category_keyword(old_name))
+    refresh_category_keyword(connection, category_keyword(target.name))
+
+
+@event.listens_for(SubCategory, "after_delete")
+def _unindex_deleted_subcategory(mapper, connection, target):
+    refresh_category_keyword(connection, category_keyword(target.name))
@@ -1,29 +1,201 @@
 import logging
-logging.basicConfig(level=logging.DEBUG)
+from backend import config
+logging.basicConfig(level=config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
+import time
+_import_started = time.perf_counter()
 
+from contextlib import asynccontextmanager
+from importlib import import_module
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 import os
 
 import backend.database as database
 import backend.models as models
-from backend.database import get_db
-from backend.crud import category as cat_crud
-from backend.routes import (
-    civitai_import,
-    civitai_test,
-    asset_routes,
-    category_routes,
-    upload_routes,
-    import_zip_route,
-    asset_type_routes,
-    image_metadata_extract
-)
+from backend.metrics import MetricsMiddleware
+
+logger = logging.getLogger(__name__)
+
+# Migrationsverzeichnis neben dem Paket (alembic.ini: script_location = alembic)
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+MEDIA_DIR = os.path.join("import", "images")
+
+# 🗂️ Schema nur anlegen, wenn die Datenbank leer ist; ein veralteter Stand wird nicht überdeckt
+def current_revisions(connection) -> set:
+    # Alembic erst hier laden, der Import kostet mehr als der Rest des Starts
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+def head_revisions() -> set:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(ALEMBIC_DIR).get_heads())
+
+def schema_is_current(connection) -> bool:
+    current = current_revisions(connection)
+    if not current or not os.path.isdir(ALEMBIC_DIR):
+        return False
+    return current == head_revisions()
+
+def stamp_head(connection):
+    # Wie "alembic stamp head", aber in der laufenden Transaktion: Schema und Stand landen zusammen
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    MigrationContext.configure(connection).stamp(ScriptDirectory(ALEMBIC_DIR), "head")
+
+def ensure_schema() -> bool:
+    """Gibt zurück, ob create_all gelaufen ist."""
+    with database.engine.begin() as connection:
+        if schema_is_current(connection):
+            return False
+        if not os.path.isdir(ALEMBIC_DIR):
+            # Ohne Migrationen lässt sich der Stand nicht prüfen, wie früher einfach anlegen
+            database.Base.metadata.create_all(bind=connection)
+            return True
+
+        if not inspect(connection).get_table_names():
+            # Leere Datenbank: create_all legt den neuesten Stand an, den Alembic-Stand gleich dazu
+            # setzen, damit der nächste Start den schnellen Weg nimmt
+            database.Base.metadata.create_all(bind=connection)
+            stamp_head(connection)
+            return True
+
+        # create_all legt nur fehlende Tabellen an, keine neuen Spalten in bestehenden
+        current = current_revisions(connection)
+        if current:
+            raise RuntimeError(
+                f"Datenbank-Schema ist veraltet (Alembic-Stand {', '.join(sorted(current))}, "
+                f"aktuell {', '.join(sorted(head_revisions()))}). Bitte zuerst 'alembic upgrade head' ausführen."
+            )
+        logger.warning(
+            "Datenbank hat Tabellen, aber keinen Alembic-Stand: fehlende Spalten werden nicht ergänzt. "
+            "Bitte den passenden Stand mit 'alembic stamp <revision>' setzen und 'alembic upgrade head' ausführen."
+        )
+        database.Base.metadata.create_all(bind=connection)
+        return True
+
+# 🧠 Kategorien beim Erststart
+GENERAL_CATEGORY = {
+    "title": "General",
+    "order": 0,
+    "subcategories": [
+        {"name": "All Assets", "icon": "Grid", "order": 0},
+        {"name": "Favorites", "icon": "Star", "order": 1},
+    ]
+}
+
+STARTER_STRUCTURE = [
+    {
+        "title": "Models",
+        "order": 1,
+        "subcategories": [
+            {"name": "Checkpoint", "icon": "Server", "order": 1},
+            {"name": "LoRA", "icon": "Link", "order": 2},
+            {"name": "Textual Inversion", "icon": "Quote", "order": 3},
+            {"name": "VAE", "icon": "Package", "order": 4},
+        ]
+    },
+    {
+        "title": "Styles",
+        "order": 2,
+        "subcategories": [
+            {"name": "Anime", "icon": "Image", "order": 1},
+            {"name": "Realistic", "icon": "Camera", "order": 2},
+            {"name": "Cartoon", "icon": "Smile", "order": 3},
+            {"name": "Painting", "icon": "Brush", "order": 4},
+            {"name": "3D", "icon": "Cube", "order": 5},
+        ]
+    },
+    {
+        "title": "Concepts",
+        "order": 3,
+        "subcategories": [
+            {"name": "Character", "icon": "User", "order": 1},
+            {"name": "Object", "icon": "Circle", "order": 2},
+            {"name": "Scene", "icon": "Landmark", "order": 3},
+            {"name": "Effect", "icon": "Sparkles", "order": 4},
+        ]
+    },
+    {
+        "title": "Tools",
+        "order": 4,
+        "subcategories": [
+            {"name": "Pose", "icon": "Move", "order": 1},
+            {"name": "Workflow", "icon": "Repeat", "order": 2},
+            {"name": "Inpainting", "icon": "Eraser", "order": 3},
+            {"name": "ControlNet", "icon": "SlidersHorizontal", "order": 4},
+        ]
+    },
+    {
+        "title": "Media",
+        "order": 5,
+        "subcategories": [
+            {"name": "Image", "icon": "Image", "order": 1},
+            {"name": "Video", "icon": "Video", "order": 2},
+            {"name": "GIF", "icon": "PlayCircle", "order": 3},
+        ]
+    }
+]
 
-app = FastAPI()
+def initialize_categories() -> int:
+    """Legt fehlende Start-Kategorien in einer Transaktion an; gibt die Zahl neuer Kategorien zurück."""
+    db: Session = database.SessionLocal()
+    try:
+        titles = [title for (title,) in db.query(models.Category.title).all()]
+
+        # 👉 Systemkategorie „General" + feste Unterkategorien, Starter-Struktur nur ohne eigene Kategorien
+        seed = []
+        if "General" not in titles:
+            seed.append(GENERAL_CATEGORY)
+        if not any(title != "General" for title in titles):
+            seed.extend(STARTER_STRUCTURE)
+        if not seed:
+            return 0
+
+        for cat in seed:
+            db.add(models.Category(
+                title=cat["title"],
+                order=cat["order"],
+                subcategories=[
+                    models.SubCategory(name=sub["name"], icon=sub["icon"], order=sub["order"])
+                    for sub in cat["subcategories"]
+                ],
+            ))
+        db.commit()
+        return len(seed)
+    finally:
+        db.close()
+
+# 🚀 Start: Schema prüfen, Kategorien anlegen, Zeiten protokollieren
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    created_schema = ensure_schema()
+    schema_ms = (time.perf_counter() - started) * 1000
+
+    seeded = initialize_categories()
+    seed_ms = (time.perf_counter() - started) * 1000 - schema_ms
+
+    os.makedirs(MEDIA_DIR, exist_ok=True)
+    logger.info(
+        "Kaltstart: Importe %.1f ms, Schema %.1f ms (%s), Kategorien %.1f ms (%d neu), gesamt %.1f ms",
+        _imports_ms,
+        schema_ms,
+        "create_all" if created_schema else "Alembic-Stand aktuell",
+        seed_ms,
+        seeded,
+        _imports_ms + (time.perf_counter() - started) * 1000,
+    )
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # 🌐 CORS aktivieren
 app.add_middleware(
@@ -32,107 +204,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-DB-Queries", "Server-Timing", "X-Profile"],
 )
 
-# 🗂️ Datenbanktabellen erstellen
-database.Base.metadata.create_all(bind=database.engine)
+# ⏱️ Einzelne Anfragen auf Zuruf profilieren, nur wenn in der Konfiguration eingeschaltet
+if config.PROFILING_ENABLED:
+    from backend.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
 
-# 🧠 Kategorien initialisieren (bei Erststart)
-def initialize_categories():
-    db: Session = next(get_db())
-    try:
-        existing = cat_crud.get_categories(db)
-
-        # 👉 Systemkategorie „General" + feste Unterkategorien anlegen
-        if not any(cat.title == "General" for cat in existing):
-            general = cat_crud.create_category(db, "General", 0)
-            cat_crud.add_subcategory(db, general.id, "All Assets", "Grid", 0)
-            cat_crud.add_subcategory(db, general.id, "Favorites", "Star", 1)
-
-        # 👉 Nur wenn keine weiteren Kategorien vorhanden sind, Starter-Struktur anlegen
-        user_defined = [cat for cat in existing if cat.title != "General"]
-
-        if not user_defined:
-            starter_structure = [
-                {
-                    "title": "Models",
-                    "order": 1,
-                    "subcategories": [
-                        {"name": "Checkpoint", "icon": "Server", "order": 1},
-                        {"name": "LoRA", "icon": "Link", "order": 2},
-                        {"name": "Textual Inversion", "icon": "Quote", "order": 3},
-                        {"name": "VAE", "icon": "Package", "order": 4},
-                    ]
-                },
-                {
-                    "title": "Styles",
-                    "order": 2,
-                    "subcategories": [
-                        {"name": "Anime", "icon": "Image", "order": 1},
-                        {"name": "Realistic", "icon": "Camera", "order": 2},
-                        {"name": "Cartoon", "icon": "Smile", "order": 3},
-                        {"name": "Painting", "icon": "Brush", "order": 4},
-                        {"name": "3D", "icon": "Cube", "order": 5},
-                    ]
-                },
-                {
-                    "title": "Concepts",
-                    "order": 3,
-                    "subcategories": [
-                        {"name": "Character", "icon": "User", "order": 1},
-                        {"name": "Object", "icon": "Circle", "order": 2},
-                        {"name": "Scene", "icon": "Landmark", "order": 3},
-                        {"name": "Effect", "icon": "Sparkles", "order": 4},
-                    ]
-                },
-                {
-                    "title": "Tools",
-                    "order": 4,
-                    "subcategories": [
-                        {"name": "Pose", "icon": "Move", "order": 1},
-                        {"name": "Workflow", "icon": "Repeat", "order": 2},
-                        {"name": "Inpainting", "icon": "Eraser", "order": 3},
-                        {"name": "ControlNet", "icon": "SlidersHorizontal", "order": 4},
-                    ]
-                },
-                {
-                    "title": "Media",
-                    "order": 5,
-                    "subcategories": [
-                        {"name": "Image", "icon": "Image", "order": 1},
-                        {"name": "Video", "icon": "Video", "order": 2},
-                        {"name": "GIF", "icon": "PlayCircle", "order": 3},
-                    ]
-                }
-            ]
-
-            for cat in starter_structure:
-                new_cat = cat_crud.create_category(db, cat["title"], cat["order"])
-                for sub in cat["subcategories"]:
-                    cat_crud.add_subcategory(
-                        db,
-                        new_cat.id,
-                        sub["name"],
-                        sub["icon"],
-                        sub["order"]
-                    )
+# 📈 Anfragen, Latenz, Antwortgrößen und SQL-Anweisungen pro Endpunkt zählen (GET /api/metrics)
+app.add_middleware(MetricsMiddleware)
 
-        db.commit()
-    finally:
-        db.close()
+# 🖼️ Medien-Ordner mounten (der Ordner wird beim Start angelegt)
+app.mount("/import/images", StaticFiles(directory=MEDIA_DIR, check_dir=False), name="import-images")
+
+# 📡 API-Routen registrieren. Die Router-Module sind billig zu importieren: requests, aiohttp und
+# PIL laden erst beim ersten Aufruf eines Endpunkts, der sie braucht (Budget: python -m backend.import_budget)
+ROUTERS = [
+    ("backend.routes.asset_routes", "/api/assets", ["Assets"]),
+    ("backend.routes.category_routes", "/api/categories", ["Categories"]),
+    ("backend.routes.civitai_import", "/api/import", ["Import"]),
+    ("backend.routes.civitai_test", "/api/test", ["Test"]),
+    ("backend.routes.upload_routes", "/api", ["Upload"]),
+    ("backend.routes.import_zip_route", "/api", ["ZIP Import"]),
+    ("backend.routes.asset_type_routes", "/api/asset-types", ["Asset Types"]),
+    ("backend.routes.image_metadata_extract", "/api/image", ["Image Metadata"]),
+    ("backend.routes.metrics_routes", "/api", ["Metrics"]),
+]
+
+for module, prefix, tags in ROUTERS:
+    app.include_router(import_module(module).router, prefix=prefix, tags=tags)
 
-# 🔁 Kategorien initialisieren
-initialize_categories()
-
-# 🖼️ Medien-Ordner mounten
-app.mount("/import/images", StaticFiles(directory=os.path.join("import", "images")), name="import-images")
-
-# 📡 API-Routen registrieren
-app.include_router(asset_routes.router, prefix="/api/assets", tags=["Assets"])
-app.include_router(category_routes.router, prefix="/api/categories", tags=["Categories"])
-app.include_router(civitai_import.router, prefix="/api/import", tags=["Import"])
-app.include_router(civitai_test.router, prefix="/api/test", tags=["Test"])
-app.include_router(upload_routes.router, prefix="/api", tags=["Upload"])
-app.include_router(import_zip_route.router, prefix="/api", tags=["ZIP Import"])
-app.include_router(asset_type_routes.router, prefix="/api/asset-types", tags=["Asset Types"])
-app.include_router(image_metadata_extract.router, prefix="/api/image", tags=["Image Metadata"])
+# Importzeit des Moduls samt Routern, wird beim Start mitprotokolliert
+_imports_ms = (time.perf_counter() - _import_started) * 1000
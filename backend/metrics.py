@@ -0,0 +1,196 @@
+# backend/metrics.py
+#
+# Laufzeitmetriken der API im Prometheus-Textformat (GET /api/metrics). Eine ASGI-Middleware
+# zählt pro Endpunkt Anfragen und Statuscodes, misst Latenz und Antwortgröße als Histogramme
+# und führt die Zahl gerade laufender Anfragen. Dazu kommen SQL-Anweisungen und Datenbankzeit
+# pro Anfrage (backend/querystats.py). Alles liegt im Prozessspeicher; bei mehreren Workern
+# liefert jeder seine eigenen Werte.
+
+import threading
+import time
+from . import config, querystats
+
+# Obergrenzen der Histogramm-Buckets (Sekunden bzw. Bytes), +Inf kommt automatisch dazu
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Anfragen ohne passende Route (404) teilen sich ein Label, sonst wächst die Zahl der Reihen unbegrenzt
+UNMATCHED = "none"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+def _labels(**values) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values.values())
+    return ",".join(f'{key}="{value}"' for key, value in zip(values, escaped))
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}   # (method, handler, status) -> Anzahl
+        self.latency = {}    # (method, handler) -> Histogram
+        self.sizes = {}      # (method, handler) -> Histogram
+        self.queries = {}    # (method, handler) -> Histogram der Anweisungen pro Anfrage
+        self.db_time = {}    # (method, handler) -> Histogram der Datenbankzeit pro Anfrage
+        self.repeated = {}   # (method, handler) -> Anfragen mit N+1-Verdacht
+        self.in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, handler: str, status: int, seconds: float, size: int,
+                 queries: int = 0, db_seconds: float = 0.0, repeated: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, handler, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            route = (method, handler)
+            if route not in self.latency:
+                self.latency[route] = Histogram(LATENCY_BUCKETS)
+                self.sizes[route] = Histogram(SIZE_BUCKETS)
+                self.queries[route] = Histogram(QUERY_COUNT_BUCKETS)
+                self.db_time[route] = Histogram(LATENCY_BUCKETS)
+            self.latency[route].observe(seconds)
+            self.sizes[route].observe(size)
+            self.queries[route].observe(queries)
+            self.db_time[route].observe(db_seconds)
+            if repeated:
+                self.repeated[route] = self.repeated.get(route, 0) + 1
+
+    def render(self) -> str:
+        """Alle Werte im Prometheus-Textformat (Version 0.0.4)."""
+        with self._lock:
+            lines = [
+                "# HELP lokarni_http_requests_total Abgeschlossene HTTP-Anfragen",
+                "# TYPE lokarni_http_requests_total counter",
+            ]
+            for (method, handler, status), count in sorted(self.requests.items()):
+                lines.append(f"lokarni_http_requests_total{{{_labels(method=method, handler=handler, status=status)}}} {count}")
+
+            lines += [
+                "# HELP lokarni_http_request_duration_seconds Dauer der Anfragen bis zum letzten Antwort-Byte",
+                "# TYPE lokarni_http_request_duration_seconds histogram",
+            ]
+            for (method, handler), histogram in sorted(self.latency.items()):
+                lines.extend(histogram.samples("lokarni_http_request_duration_seconds", _labels(method=method, handler=handler)))
+
+            lines += [
+                "# HELP lokarni_http_response_size_bytes Größe des Antwort-Bodys",
+                "# TYPE lokarni_http_response_size_bytes histogram",
+            ]
+            for (method, handler), histogram in sorted(self.sizes.items()):
+                lines.extend(histogram.samples("lokarni_http_response_size_bytes", _labels(method=method, handler=handler)))
+
+            lines += [
+                "# HELP lokarni_db_queries_per_request SQL-Anweisungen pro Anfrage",
+                "# TYPE lokarni_db_queries_per_request histogram",
+            ]
+            for (method, handler), histogram in sorted(self.queries.items()):
+                lines.extend(histogram.samples("lokarni_db_queries_per_request", _labels(method=method, handler=handler)))
+
+            lines += [
+                "# HELP lokarni_db_time_seconds Zeit in der Datenbank pro Anfrage",
+                "# TYPE lokarni_db_time_seconds histogram",
+            ]
+            for (method, handler), histogram in sorted(self.db_time.items()):
+                lines.extend(histogram.samples("lokarni_db_time_seconds", _labels(method=method, handler=handler)))
+
+            lines += [
+                "# HELP lokarni_db_repeated_query_requests_total Anfragen, die eine Anweisung öfter als die N+1-Schwelle ausführten",
+                "# TYPE lokarni_db_repeated_query_requests_total counter",
+            ]
+            for (method, handler), count in sorted(self.repeated.items()):
+                lines.append(f"lokarni_db_repeated_query_requests_total{{{_labels(method=method, handler=handler)}}} {count}")
+
+            lines += [
+                "# HELP lokarni_http_requests_in_flight Gerade bearbeitete HTTP-Anfragen",
+                "# TYPE lokarni_http_requests_in_flight gauge",
+                f"lokarni_http_requests_in_flight {self.in_flight}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def handler_name(scope) -> str:
+    # Der Router hinterlegt den Endpunkt im Scope; Modul + Funktionsname bleiben stabil und begrenzt
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED
+    name = getattr(endpoint, "__name__", type(endpoint).__name__)
+    module = getattr(endpoint, "__module__", "") or ""
+    return f"{module.rsplit('.', 1)[-1]}.{name}" if module else name
+
+
+class MetricsMiddleware:
+    """Reine ASGI-Middleware, damit Streaming-Antworten nicht gepuffert werden."""
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+        stats, token = querystats.start()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if config.QUERY_STATS_HEADERS:
+                    # Stand beim Senden der Header; bei Streaming-Antworten kommen danach noch Anweisungen dazu
+                    db_ms = stats.seconds * 1000
+                    message = {**message, "headers": [
+                        *message.get("headers", []),
+                        (b"x-db-queries", str(stats.count).encode()),
+                        (b"server-timing", f'db;dur={db_ms:.1f};desc="{stats.count} queries"'.encode()),
+                    ]}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.registry.started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            handler = handler_name(scope)
+            repeated = querystats.finish(stats, token, f"{scope['method']} {handler}")
+            self.registry.finished(
+                scope["method"], handler, status, time.perf_counter() - started, size,
+                queries=stats.count, db_seconds=stats.seconds, repeated=bool(repeated),
+            )
@@ -1,6 +1,6 @@
 # backend/models.py
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DDL, Index, event, func, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.sqlite import JSON
 from .database import Base
@@ -29,11 +29,27 @@ class Asset(Base):
     base_model = Column(String, default="")
     created_at = Column(String, default="")
     nsfw_level = Column(String, default="")
+    nsfw_rating = Column(Integer, nullable=False, default=0, server_default="0")  # aus nsfw_level abgeleitet
     download_url = Column(String, default="")
     media_files = Column(JSON, default=[])
     
     custom_fields = Column(JSON, nullable=True, default={})
-    linked_assets = Column(JSON, default=[])
+
+    # 🔗 Verknüpfte Assets (beidseitig in asset_links, geschrieben per SQL in crud.asset.set_asset_links)
+    links = relationship(
+        "AssetLink",
+        foreign_keys="AssetLink.asset_id",
+        order_by="AssetLink.linked_id",
+        lazy="selectin",
+        viewonly=True,
+    )
+
+    @property
+    def linked_assets(self):
+        return [link.linked_id for link in self.links]
+
+    # 🔎 Vorberechneter, kleingeschriebener Suchtext (wird bei jedem Schreiben aktualisiert)
+    search_text = Column(Text, default="")
 
 
     # 🔗 Beziehung zur SubCategory
@@ -41,6 +57,176 @@ class Asset(Base):
     subcategory = relationship("SubCategory", back_populates="assets")
 
 
+# Felder, aus denen der Suchtext für Sidebar-Kategorien und Subkategorie-Zuweisung besteht
+SEARCH_TEXT_FIELDS = [
+    "name",
+    "tags",
+    "trigger_words",
+    "positive_prompt",
+    "negative_prompt",
+    "used_resources",
+    "type",
+]
+
+def build_search_text(obj) -> str:
+    # Funktioniert für ORM-Objekte und Pydantic-Schemas gleichermaßen
+    return " ".join(getattr(obj, field, None) or "" for field in SEARCH_TEXT_FIELDS).lower()
+
+@event.listens_for(Asset, "before_insert")
+@event.listens_for(Asset, "before_update")
+def _update_search_text(mapper, connection, target):
+    target.search_text = build_search_text(target)
+
+Index("ix_assets_search_text", Asset.search_text)
+
+# 🧠 Felder für die automatische Subkategorie-Zuweisung; bewusst mehr als der Suchtext
+# (Beschreibung, Slug, Ersteller und Basismodell ordnen ein Asset ebenfalls zu)
+CLASSIFICATION_FIELDS = [
+    "name",
+    "description",
+    "tags",
+    "trigger_words",
+    "positive_prompt",
+    "negative_prompt",
+    "used_resources",
+    "slug",
+    "creator",
+    "base_model",
+]
+
+def build_classification_text(obj) -> str:
+    return " ".join(getattr(obj, field, None) or "" for field in CLASSIFICATION_FIELDS).lower()
+
+
+# 🔞 nsfw_level ist freier Text (CivitAI liefert Zahlen oder Booleans, manuell angelegte Assets "").
+# Als sicher (0) gilt wie bisher nur "0" bzw. NULL, Zahlen bleiben erhalten, alles andere zählt als 1.
+def nsfw_rating(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    text = str(value).strip()
+    return int(text) if text.isdecimal() else 1
+
+@event.listens_for(Asset, "before_insert")
+@event.listens_for(Asset, "before_update")
+def _update_nsfw_rating(mapper, connection, target):
+    target.nsfw_rating = nsfw_rating(target.nsfw_level)
+
+# Zusammengesetzte Indizes für die Filter der Listen (NSFW allein oder kombiniert)
+Index("ix_assets_nsfw_rating", Asset.nsfw_rating)
+Index("ix_assets_favorite_nsfw", Asset.is_favorite, Asset.nsfw_rating)
+Index("ix_assets_type_nsfw", Asset.type, Asset.nsfw_rating)
+Index("ix_assets_subcategory_nsfw", Asset.subcategory_id, Asset.nsfw_rating)
+
+
+# 🔎 Volltextindex (SQLite FTS5) über alle durchsuchbaren Asset-Felder.
+# Der Index ist eine "external content"-Tabelle und wird per Trigger synchron gehalten,
+# der Trigram-Tokenizer erlaubt Teilstring-Suche wie bisher (`kw in text`).
+ASSET_FTS_COLUMNS = [
+    "name",
+    "description",
+    "tags",
+    "trigger_words",
+    "positive_prompt",
+    "negative_prompt",
+    "used_resources",
+    "type",
+    "model_version",
+    "base_model",
+    "slug",
+    "creator",
+]
+
+_fts_columns = ", ".join(ASSET_FTS_COLUMNS)
+_fts_new = ", ".join(f"new.{c}" for c in ASSET_FTS_COLUMNS)
+_fts_old = ", ".join(f"old.{c}" for c in ASSET_FTS_COLUMNS)
+
+ASSET_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+        {_fts_columns},
+        content='assets', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS assets_fts_ai AFTER INSERT ON assets BEGIN
+        INSERT INTO assets_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS assets_fts_ad AFTER DELETE ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS assets_fts_au AFTER UPDATE OF {_fts_columns} ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old});
+        INSERT INTO assets_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+    END""",
+]
+
+for _statement in ASSET_FTS_DDL:
+    event.listen(Asset.__table__, "after_create", DDL(_statement))
+
+
+# 📑 Sortierschlüssel für Keyset-Pagination, jeweils mit passendem Index (Schlüssel, id).
+# NULL-Werte werden per coalesce abgefangen, damit Cursor-Vergleiche eindeutig bleiben.
+ASSET_SORT_KEYS = {
+    "id": None,
+    "name": Asset.name,
+    "created_at": func.coalesce(Asset.created_at, literal_column("''")),
+    "favorite": func.coalesce(Asset.is_favorite, literal_column("0"), type_=Integer),
+}
+
+Index("ix_assets_name_id", Asset.name, Asset.id)
+Index("ix_assets_created_at_id", ASSET_SORT_KEYS["created_at"], Asset.id)
+Index("ix_assets_favorite_id", ASSET_SORT_KEYS["favorite"], Asset.id)
+
+
+# 🔗 Verknüpfungen zwischen Assets, je Paar in beide Richtungen gespeichert
+class AssetLink(Base):
+    __tablename__ = "asset_links"
+
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    linked_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+# Beim Löschen eines Assets entfernt backend.indexing die Verknüpfungen in beide Richtungen
+
+
+# 🏷️ Keyword-Häufigkeiten: Tokens pro Asset und globale Summe (für /api/assets/keywords)
+class AssetKeyword(Base):
+    __tablename__ = "asset_keywords"
+
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    keyword = Column(String, primary_key=True, index=True)
+    frequency = Column(Integer, nullable=False, default=1)
+
+
+class KeywordCount(Base):
+    __tablename__ = "keyword_counts"
+
+    keyword = Column(String, primary_key=True)
+    frequency = Column(Integer, nullable=False, default=0, index=True)
+
+
+# 🔤 Trigramm-Index für die fehlertolerante Suche (Name, Trigger-Wörter, Tags, Slug)
+class AssetTrigram(Base):
+    __tablename__ = "asset_trigrams"
+
+    trigram = Column(String, primary_key=True)
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+# 📂 Materialisierte Zuordnung Sidebar-Kategorie (Subkategorie-Name, klein) -> Asset
+class CategoryMember(Base):
+    __tablename__ = "category_members"
+
+    keyword = Column(String, primary_key=True)
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+# 🔢 Versionszähler des Katalogs, wird bei jedem Schreibvorgang erhöht (ETags, Caches)
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -68,3 +254,7 @@ class SubCategory(Base):
 
     # 🔄 Beziehung zu Assets
     assets = relationship("Asset", back_populates="subcategory")
+
+
+# Abgeleitete Tabellen und Versionszähler werden über ORM-Events gepflegt
+from . import indexing, catalog  # noqa: E402,F401
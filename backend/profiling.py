@@ -0,0 +1,145 @@
+# backend/profiling.py
+#
+# Profiling einzelner Anfragen auf Zuruf, ohne Neustart unter einem Profiler. Nur aktiv mit
+# profiling.enabled = true; eine Anfrage mit Header "X-Profile: <token>" (oder ?profile=<token>)
+# läuft dann unter einem Stack-Sampler. Das Ergebnis landet als "folded stacks" (eine Zeile pro
+# Stack, Frames mit ";" getrennt, dahinter die Anzahl Samples) in profiling.dir, direkt lesbar
+# für flamegraph.pl, inferno oder speedscope. Der Dateiname kommt im Antwort-Header X-Profile.
+#
+# Gesampelt werden alle Threads des Prozesses, weil synchrone Endpunkte im Threadpool laufen und
+# asynchrone auf der Event-Loop; wartende Threads werden verworfen. Auf einem ausgelasteten Server
+# können daher auch parallel laufende Anfragen im Profil auftauchen.
+
+import itertools
+import linecache
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Frames in diesen Modulen an der Spitze eines Stacks bedeuten: der Thread wartet nur. Dazu
+# Threads, die in einem blockierenden C-Aufruf ohne Argumente stehen (z. B. SimpleQueue.get()
+# im Worker-Thread von aiosqlite), den Aufruf selbst sieht man nicht als Python-Frame
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+_IDLE_CALL = re.compile(r"\.(get|wait|select|acquire)\(\)")
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_sequence = itertools.count(1)
+
+
+def _is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename
+    if os.path.basename(filename) in _IDLE_MODULES:
+        return True
+    return bool(_IDLE_CALL.search(linecache.getline(filename, frame.f_lineno)))
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lokarni-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self.sample_count += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _requested(scope) -> bool:
+    value = None
+    for name, header in scope.get("headers", []):
+        if name == b"x-profile":
+            value = header.decode("latin-1")
+            break
+    if value is None:
+        value = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [None])[0]
+    if not value:
+        return False
+    # Mit Token nur bei passendem Wert, sonst genügt ein beliebiger Wert (z. B. "1")
+    return not config.PROFILING_TOKEN or value == config.PROFILING_TOKEN
+
+
+class ProfilingMiddleware:
+    """Wird nur bei profiling.enabled eingehängt; immer höchstens eine Anfrage gleichzeitig."""
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, "busy"))
+            return
+
+        name = "{}-{:04d}-{}-{}.folded".format(
+            time.strftime("%Y%m%d-%H%M%S"),
+            next(_sequence),
+            scope["method"],
+            _UNSAFE_FILENAME.sub("_", scope["path"].strip("/")) or "root",
+        )
+        sampler = StackSampler(config.PROFILING_INTERVAL)
+        started = time.perf_counter()
+        # Kürzeres GIL-Umschaltintervall, sonst käme der Sampler nur alle 5 ms zum Zug
+        # (und bevorzugt dann, wenn die Anfrage gerade auf I/O wartet)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, config.PROFILING_INTERVAL / 2))
+        sampler.start()
+        try:
+            # Der Name steht schon fest, der Header geht also mit der Antwort raus
+            await self.app(scope, receive, self._with_header(send, name))
+        finally:
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+            self._busy.release()
+            os.makedirs(config.PROFILING_DIR, exist_ok=True)
+            path = os.path.join(config.PROFILING_DIR, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(sampler.folded())
+            logger.info(
+                "request profiled path=%s duration_ms=%.1f samples=%s stacks=%s",
+                path, (time.perf_counter() - started) * 1000, sampler.sample_count, len(sampler.samples),
+            )
+
+    @staticmethod
+    def _with_header(send, value: str):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile", value.encode())]}
+            await send(message)
+        return send_wrapper
@@ -0,0 +1,81 @@
+# backend/querystats.py
+#
+# SQL-Statistik pro Anfrage: Engine-Events zählen jede Anweisung und messen die Zeit in der
+# Datenbank, gesammelt für die gerade laufende Anfrage (ContextVar, gilt auch im Threadpool
+# und in AsyncSession.run_sync). Läuft dieselbe Anweisungsform in einer Anfrage öfter als
+# N_PLUS_ONE_THRESHOLD-mal, wird das als Verdacht auf ein N+1-Muster protokolliert.
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from . import config, database
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = config.N_PLUS_ONE_THRESHOLD
+
+_current = ContextVar("lokarni_query_stats", default=None)
+
+# Aufgeklappte IN-Listen ("IN (?, ?, ?)") haben je nach Länge einen anderen Text, zählen aber als eine Form
+_IN_LIST = re.compile(r"\(\?(?:\s*,\s*\?)*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int = None):
+        """Anweisungsformen, die öfter als threshold-mal liefen, häufigste zuerst."""
+        threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        shapes = Counter()
+        for statement, count in self.shapes.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count > threshold]
+
+
+def start() -> tuple:
+    """Beginnt die Zählung für die aktuelle Anfrage; das Token geht an finish()."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def finish(stats: QueryStats, token, label: str) -> list:
+    """Beendet die Zählung, protokolliert wiederholte Anweisungen und gibt sie zurück."""
+    _current.reset(token)
+    repeated = stats.repeated()
+    for shape, count in repeated:
+        logger.warning("repeated query (possible N+1) handler=%s count=%s statement=%s", label, count, shape)
+    return repeated
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._lokarni_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_lokarni_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+# Beide Engines: die synchrone (Schreib-Endpunkte) und die unter der AsyncSession
+for _engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,21 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from collections import Counter
+from typing import Optional, Union
+import logging
 import os
 import shutil
-from .. import database, models, schemas
-from .civitai_import import import_from_civitai
+from .. import database, models, schemas, catalog
+from ..cache import query_cache
+from ..crud import asset as asset_crud
+from ..crud import keyword as keyword_crud
+from ..suggest import keyword_trie, SUGGEST_TOP_N
 
 router = APIRouter()
 
-# Add route duplication with trailing slash
-@router.get("/{asset_id}/", response_model=schemas.Asset)
-def get_asset_with_slash(asset_id: int, db: Session = Depends(database.get_db)):
-    return get_asset(asset_id, db)
+logger = logging.getLogger(__name__)
+
+# List endpoints answer 304 while the asset catalog is unchanged
+assets_etag = Depends(catalog.conditional(catalog.ASSETS))
+
+# Upper bound for one page of keyset pagination
+MAX_PAGE_SIZE = 500
+
+# Relevance-ranked searches only materialize the best N hits unless a limit is given
+SEARCH_TOP_K = 100
+
+# "summary" returns only the fields the grid needs, the detail view keeps using GET /{asset_id}
+ASSET_VIEWS = ["full", "summary"]
+AssetList = Union[list[schemas.Asset], list[schemas.AssetSummary]]
+
+def paginate(db: Session, query, response: Response, sort: str, after: Optional[str], limit: Optional[int], view: str, cache_key: tuple, sort_expr=None):
+    if view not in ASSET_VIEWS:
+        raise HTTPException(status_code=400, detail=f"Unbekannte Ansicht '{view}', erlaubt: {', '.join(ASSET_VIEWS)}")
+    if limit is not None:
+        if limit < 1:
+            raise HTTPException(status_code=400, detail="limit muss größer als 0 sein")
+        limit = min(limit, MAX_PAGE_SIZE)
 
-@router.get("/search/", response_model=list[schemas.Asset])
-def search_assets_with_slash(q: str = "", category: str = "All", nsfw_filter: bool = False, db: Session = Depends(database.get_db)):
-    return search_assets(q, category, nsfw_filter, db)
+    def run_query():
+        page_query = asset_crud.summary_only(query) if view == "summary" else query
+        assets, next_cursor = asset_crud.paginate_assets(page_query, sort=sort, after=after, limit=limit, sort_expr=sort_expr)
+        schema = schemas.AssetSummary if view == "summary" else schemas.Asset
+        return [schema.model_validate(asset) for asset in assets], next_cursor
+
+    # Serialized pages are cached per catalog version, identical requests skip the query.
+    # Unpaged requests hold the whole catalog; the cache only bounds the number of entries, so they bypass it
+    try:
+        if limit is None:
+            items, next_cursor = run_query()
+        else:
+            items, next_cursor = query_cache.cached(db, (catalog.ASSETS,), cache_key + (sort, after, limit, view), run_query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The cursor for the following page travels in a header so the body stays a plain list
+    if next_cursor and response is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# Add route duplication with trailing slash
+@router.get("/{asset_id}/", response_model=Union[schemas.AssetDetail, schemas.Asset])
+async def get_asset_with_slash(asset_id: int, expand: Optional[str] = None, depth: int = 1, db: AsyncSession = Depends(database.get_async_db)):
+    return await get_asset(asset_id, expand=expand, depth=depth, db=db)
+
+@router.get("/search/", response_model=AssetList, dependencies=[assets_etag])
+async def search_assets_with_slash(
+    response: Response,
+    q: str = "",
+    category: str = "All",
+    nsfw_filter: bool = False,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: str = "relevance",
+    view: str = "full",
+    fuzzy: bool = False,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    return await search_assets(response, q=q, category=category, nsfw_filter=nsfw_filter, limit=limit, after=after, sort=sort, view=view, fuzzy=fuzzy, db=db)
 
 @router.patch("/{asset_id}/", response_model=schemas.Asset)
 def update_asset_with_slash(asset_id: int, asset_data: schemas.AssetUpdate, db: Session = Depends(database.get_db)):
@@ -27,107 +90,29 @@ def update_asset(asset_id: int, asset_data: schemas.AssetUpdate, db: Session = D
     if not db_asset:
         raise HTTPException(status_code=404, detail="Asset nicht gefunden")
 
-    # Save old linked assets for bidirectional updates
-    old_linked_assets = db_asset.linked_assets or []
-    if isinstance(old_linked_assets, list):
-        # Normalize IDs (convert strings to ints)
-        old_linked_assets = [int(x) if isinstance(x, str) and x.isdigit() else x for x in old_linked_assets]
-    else:
-        old_linked_assets = []
-
     # Get the data as a dictionary with only set fields
     update_data = asset_data.dict(exclude_unset=True)
     
-    # Debug: Print what data is being received
-    print(f"Update data for asset {asset_id}: {update_data}")
-    
-    # Special handling for linked_assets - it might be coming in as full asset objects
-    # but we only want to store the IDs
-    if 'linked_assets' in update_data:
-        linked_assets = update_data['linked_assets']
-        
-        # If linked_assets is None, set it to an empty list
-        if linked_assets is None:
-            update_data['linked_assets'] = []
-            print(f"Leere linked_assets Liste gesetzt (None)")
-        # If linked_assets is an empty list, keep it
-        elif isinstance(linked_assets, list) and len(linked_assets) == 0:
-            update_data['linked_assets'] = []
-            print(f"Leere linked_assets Liste beibehalten")
-        # If we received full asset objects instead of just IDs, extract the IDs
-        elif isinstance(linked_assets, list):
-            # Check if it is a list of objects with an 'id'
-            if len(linked_assets) > 0 and isinstance(linked_assets[0], dict) and 'id' in linked_assets[0]:
-                # Convert list of asset objects to a list of asset IDs
-                update_data['linked_assets'] = [asset['id'] for asset in linked_assets if isinstance(asset, dict) and 'id' in asset]
-                print(f"Konvertierte linked_assets zu IDs: {update_data['linked_assets']}")
-            # If it's already a list of IDs, convert string IDs to integers
-            elif all(isinstance(item, (int, str)) for item in linked_assets):
-                # Konvertiere String-IDs zu Integer-IDs
-                update_data['linked_assets'] = [int(item) if isinstance(item, str) and item.isdigit() else item for item in linked_assets]
-                print(f"linked_assets ist bereits eine Liste von IDs: {update_data['linked_assets']}")
-            # For other formats, set to an empty list
-            else:
-                update_data['linked_assets'] = []
-                print(f"Unbekanntes Format für linked_assets, setze auf leere Liste")
-        # For other types, set to an empty list
-        else:
-            update_data['linked_assets'] = []
-            print(f"linked_assets ist kein gültiges Format, setze auf leere Liste")
+    # Arguments are only formatted when DEBUG logging is enabled
+    logger.debug("asset update received id=%s fields=%s", asset_id, update_data)
     
+    # Links live in asset_links and are written as a set diff (both directions)
+    relink = 'linked_assets' in update_data
+    linked_ids = update_data.pop('linked_assets', None)
+
     # Apply all updates
     for field, value in update_data.items():
         setattr(db_asset, field, value)
 
-    # Handle bidirectional relationships for linked_assets
-    if 'linked_assets' in update_data:
-        new_linked_assets = update_data['linked_assets']
-        
-        # 1. Find assets that were removed (in old_linked_assets but not in new_linked_assets)
-        removed_assets = [asset_id for asset_id in old_linked_assets 
-                         if asset_id not in new_linked_assets]
-        
-        # 2. Remove bidirectional links for removed assets
-        for removed_id in removed_assets:
-            try:
-                removed_asset = db.query(models.Asset).filter(models.Asset.id == removed_id).first()
-                if removed_asset:
-                    removed_asset_links = removed_asset.linked_assets or []
-                    if isinstance(removed_asset_links, list):
-                        # Normalize IDs
-                        removed_asset_links = [int(x) if isinstance(x, str) and x.isdigit() else x
-                                              for x in removed_asset_links]
-                        # Remove link
-                        if asset_id in removed_asset_links:
-                            removed_asset.linked_assets = [x for x in removed_asset_links if x != asset_id]
-                            print(f"Removed bidirectional link from asset {removed_id} to {asset_id}")
-            except Exception as e:
-                print(f"Error removing bidirectional link from asset {removed_id}: {str(e)}")
-                
-        # 3. Add bidirectional links for new assets
-        for linked_id in new_linked_assets:
-            try:
-                # Find the linked asset
-                linked_asset = db.query(models.Asset).filter(models.Asset.id == linked_id).first()
-                if linked_asset:
-                    # Ensure the linked asset also links back to this asset
-                    linked_asset_links = linked_asset.linked_assets or []
-                    if isinstance(linked_asset_links, list):
-                        # Convert any strings to ints
-                        linked_asset_links = [int(x) if isinstance(x, str) and x.isdigit() else x for x in linked_asset_links]
-                        # If this asset's ID isn't in the linked asset's links, add it
-                        if asset_id not in linked_asset_links:
-                            linked_asset.linked_assets = linked_asset_links + [asset_id]
-                            print(f"Added bidirectional link from asset {linked_id} back to {asset_id}")
-            except Exception as e:
-                print(f"Error adding bidirectional link to asset {linked_id}: {str(e)}")
+    if relink:
+        asset_crud.set_asset_links(db, asset_id, linked_ids)
 
     # Commit changes to database
     db.commit()
     db.refresh(db_asset)
     
-    # Debug: Print the asset after update
-    print(f"Updated asset: {db_asset.id}, linked_assets: {db_asset.linked_assets}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("asset updated id=%s linked_assets=%s", db_asset.id, db_asset.linked_assets)
     
     return db_asset
 
@@ -146,47 +131,57 @@ def toggle_favorite(asset_id: int, db: Session = Depends(database.get_db)):
 def toggle_favorite_with_slash(asset_id: int, db: Session = Depends(database.get_db)):
     return toggle_favorite(asset_id, db)
 
-@router.get("/", response_model=list[schemas.Asset])
-def get_assets(
+@router.get("/", response_model=AssetList, dependencies=[assets_etag])
+async def get_assets(
+    response: Response,
+    category: str = None,
+    favorite: bool = False,
+    nsfw_filter: bool = False,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: str = "id",
+    view: str = "full",
+    type: Optional[str] = None,
+    subcategory_id: Optional[int] = None,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    # The query helpers are synchronous; run_sync drives them over aiosqlite without a threadpool worker
+    return await db.run_sync(
+        list_assets, response, category=category, favorite=favorite, nsfw_filter=nsfw_filter, limit=limit,
+        after=after, sort=sort, view=view, type=type, subcategory_id=subcategory_id,
+    )
+
+def list_assets(
+    db: Session,
+    response: Response,
     category: str = None,
     favorite: bool = False,
     nsfw_filter: bool = False,
-    db: Session = Depends(database.get_db)
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: str = "id",
+    view: str = "full",
+    type: Optional[str] = None,
+    subcategory_id: Optional[int] = None,
 ):
     query = db.query(models.Asset)
+
+    if type:
+        query = query.filter(models.Asset.type == type)
+    if subcategory_id is not None:
+        query = query.filter(models.Asset.subcategory_id == subcategory_id)
     
     # Apply NSFW filtering if requested
     if nsfw_filter:
-        # Filter to only include assets with nsfw_level == "0" or nsfw_level is NULL
-        query = query.filter((models.Asset.nsfw_level == "0") | (models.Asset.nsfw_level == None))
-
-    if category in ["Favorites", "Favoriten"]:
-        query = query.filter(models.Asset.is_favorite == True)
-        return query.all()
+        # Only assets rated safe (nsfw_level "0" or NULL), answered from the nsfw_rating indexes
+        query = query.filter(models.Asset.nsfw_rating == 0)
 
-    if favorite:
+    if category in ["Favorites", "Favoriten"] or favorite:
         query = query.filter(models.Asset.is_favorite == True)
-        return query.all()
-
-    if category and category not in ["All", "All Assets"]:
-        all_assets = query.all()
-        category_lower = category.lower()
-
-        def matches_category(asset):
-            combined = " ".join([
-                asset.name or "",      # Name/title added
-                asset.tags or "",
-                asset.trigger_words or "",
-                asset.positive_prompt or "",
-                asset.negative_prompt or "",
-                asset.used_resources or "",
-                asset.type or ""
-            ]).lower()
-            return category_lower in combined
+    elif category and category not in ["All", "All Assets"]:
+        query = query.filter(asset_crud.category_filter(db, category))
 
-        return list(filter(matches_category, all_assets))
-
-    return query.all()
+    return paginate(db, query, response, sort, after, limit, view, ("assets", category, favorite, nsfw_filter, type, subcategory_id))
 
 @router.post("/", response_model=schemas.Asset)
 def create_asset(asset: schemas.AssetCreate, db: Session = Depends(database.get_db)):
@@ -218,113 +213,213 @@ def create_asset(asset: schemas.AssetCreate, db: Session = Depends(database.get_
     db.refresh(new_asset)
     return new_asset
 
-@router.get("/keywords")
-def get_keywords(q: str = "", category: str = "All", nsfw_filter: bool = False, db: Session = Depends(database.get_db)):
-    query = db.query(models.Asset)
-    
+@router.get("/keywords", dependencies=[assets_etag])
+async def get_keywords(q: str = "", category: str = "All", nsfw_filter: bool = False, db: AsyncSession = Depends(database.get_async_db)):
+    return await db.run_sync(keyword_counts, q, category, nsfw_filter)
+
+def keyword_counts(db: Session, q: str, category: str, nsfw_filter: bool):
+    # Counts come from the keyword tables maintained on every asset write
+    asset_ids = None
+    filters = []
+
     # Apply NSFW filtering if requested
     if nsfw_filter:
-        query = query.filter((models.Asset.nsfw_level == "0") | (models.Asset.nsfw_level == None))
-    
-    assets = query.all()
-    keywords = []
+        filters.append(models.Asset.nsfw_rating == 0)
 
     if category not in ["All", "All Assets", "Favoriten", "Favorites"]:
-        category_lower = category.lower()
-
-        def matches_category(asset):
-            combined = " ".join([
-                asset.name or "",      # Name/title added
-                asset.tags or "",
-                asset.trigger_words or "",
-                asset.positive_prompt or "",
-                asset.negative_prompt or "",
-                asset.used_resources or "",
-                asset.type or ""
-            ]).lower()
-            return category_lower in combined
-
-        assets = list(filter(matches_category, assets))
-
-    for asset in assets:
-        content = " ".join([
-            asset.name or "",          # Name/title added
-            asset.tags or "",
-            asset.trigger_words or "",
-            asset.positive_prompt or "",
-            asset.negative_prompt or "",
-            asset.used_resources or "",
-            asset.type or "",
-            asset.model_version or "",
-            asset.base_model or "",
-            asset.slug or "",
-        ]).lower()
-
-        tokens = content.replace(",", " ").split()
-        keywords.extend(tokens)
-
-    if q:
-        keywords = [kw for kw in keywords if q.lower() in kw]
-
-    counter = Counter(keywords)
-    top_keywords = counter.most_common(15)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
-
-@router.get("/keywords/")
-def get_keywords_with_slash(q: str = "", category: str = "All", nsfw_filter: bool = False, db: Session = Depends(database.get_db)):
-    return get_keywords(q, category, nsfw_filter, db)
-
-@router.get("/search", response_model=list[schemas.Asset])
-def search_assets(q: str = "", category: str = "All", nsfw_filter: bool = False, db: Session = Depends(database.get_db)):
-    query = db.query(models.Asset)
-    
-    # Apply NSFW filtering if requested
-    if nsfw_filter:
-        # Filter to only include assets with nsfw_level == "0" or nsfw_level is NULL
-        query = query.filter((models.Asset.nsfw_level == "0") | (models.Asset.nsfw_level == None))
-    
+        filters.append(asset_crud.category_filter(db, category))
+
+    if filters:
+        asset_ids = select(models.Asset.id).where(*filters)
+
+    def run_query():
+        top_keywords = keyword_crud.top_keywords(db, prefix=q.strip(), asset_ids=asset_ids, limit=15)
+        return [{"word": word, "count": count} for word, count in top_keywords]
+
+    return query_cache.cached(db, (catalog.ASSETS,), ("keywords", q, category, nsfw_filter), run_query)
+
+@router.get("/suggest", dependencies=[assets_etag])
+async def suggest_keywords(q: str = "", limit: int = 10, db: AsyncSession = Depends(database.get_async_db)):
+    """
+    Autocomplete for the keyword box: the most frequent keywords starting with q.
+    Served from an in-memory prefix tree that follows every asset write.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit muss größer als 0 sein")
+    completions = await db.run_sync(keyword_trie.complete, q.strip(), limit=min(limit, SUGGEST_TOP_N))
+    return [{"word": word, "count": count} for word, count in completions]
+
+# Rows fetched per round trip while streaming, and the most bytes held back before a write
+STREAM_BATCH_SIZE = 500
+STREAM_CHUNK_BYTES = 64 * 1024
+
+def stream_assets_ndjson():
+    # The generator outlives the request dependencies, so it opens its own session
+    db = database.SessionLocal()
+    try:
+        buffer = []
+        size = 0
+        rows = db.query(models.Asset).order_by(models.Asset.id).yield_per(STREAM_BATCH_SIZE)
+        for count, asset in enumerate(rows, start=1):
+            line = schemas.Asset.model_validate(asset).model_dump_json() + "\n"
+            buffer.append(line)
+            size += len(line)
+            # First line goes out right away, then one write per fetched batch,
+            # earlier if the batch grows past the chunk size
+            if count == 1 or count % STREAM_BATCH_SIZE == 0 or size >= STREAM_CHUNK_BYTES:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        db.close()
+
+@router.get("/stream")
+def stream_assets():
+    """
+    Stream the whole catalog as NDJSON, one asset per line.
+    The first asset is sent immediately, the rest in chunks of at most one
+    fetched batch (or STREAM_CHUNK_BYTES), so memory use stays flat.
+    """
+    return StreamingResponse(stream_assets_ndjson(), media_type="application/x-ndjson")
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    return query_cache.stats()
+
+@router.get("/keywords/", dependencies=[assets_etag])
+async def get_keywords_with_slash(q: str = "", category: str = "All", nsfw_filter: bool = False, db: AsyncSession = Depends(database.get_async_db)):
+    return await get_keywords(q, category, nsfw_filter, db)
+
+@router.get("/search", response_model=AssetList, dependencies=[assets_etag])
+async def search_assets(
+    response: Response,
+    q: str = "",
+    category: str = "All",
+    nsfw_filter: bool = False,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: str = "relevance",
+    view: str = "full",
+    fuzzy: bool = False,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    return await db.run_sync(
+        find_assets, response, q=q, category=category, nsfw_filter=nsfw_filter, limit=limit,
+        after=after, sort=sort, view=view, fuzzy=fuzzy,
+    )
+
+def find_assets(
+    db: Session,
+    response: Response,
+    q: str = "",
+    category: str = "All",
+    nsfw_filter: bool = False,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: str = "relevance",
+    view: str = "full",
+    fuzzy: bool = False,
+):
     if not q.strip():
-        return get_assets(category=category, nsfw_filter=nsfw_filter, db=db)
+        # Without search terms there is nothing to rank
+        list_sort = "id" if sort == "relevance" else sort
+        return list_assets(db, response, category=category, nsfw_filter=nsfw_filter, limit=limit, after=after, sort=list_sort, view=view)
+
+    # Keyword matching (and BM25 scoring) runs inside SQLite via the FTS5 index,
+    # fuzzy mode ranks by shared trigrams with name, trigger words, tags and slug instead
+    sort_expr = None
+    if fuzzy:
+        candidates = asset_crud.fuzzy_scores(q)
+        if candidates is None:
+            # Only separators (e.g. ","), nothing to compare trigrams against
+            return []
+        query = db.query(models.Asset).join(candidates, models.Asset.id == candidates.c.asset_id)
+        if sort == "relevance":
+            sort_expr = candidates.c.score
+            if limit is None:
+                limit = SEARCH_TOP_K
+    elif sort == "relevance":
+        ranked = asset_crud.search_scores(q)
+        query = db.query(models.Asset).join(ranked, models.Asset.id == ranked.c.asset_id)
+        sort_expr = ranked.c.score
+        if limit is None:
+            limit = SEARCH_TOP_K
+    else:
+        query = db.query(models.Asset).filter(models.Asset.id.in_(asset_crud.search_asset_ids(q)))
 
-    keywords = q.lower().split()
-    all_assets = query.all()
+    # Apply NSFW filtering if requested
+    if nsfw_filter:
+        # Only assets rated safe (nsfw_level "0" or NULL), answered from the nsfw_rating indexes
+        query = query.filter(models.Asset.nsfw_rating == 0)
 
     if category not in ["All", "All Assets", "Favoriten", "Favorites"]:
-        category_lower = category.lower()
-
-        def matches_category(asset):
-            combined = " ".join([
-                asset.name or "",      # Name/title added
-                asset.tags or "",
-                asset.trigger_words or "",
-                asset.positive_prompt or "",
-                asset.negative_prompt or "",
-                asset.used_resources or "",
-                asset.type or ""
-            ]).lower()
-            return category_lower in combined
-
-        all_assets = list(filter(matches_category, all_assets))
-
-    def matches(asset: models.Asset):
-        content = " ".join([
-            asset.name or "",          # Name/title added
-            asset.description or "",   # Description added
-            asset.tags or "",
-            asset.trigger_words or "",
-            asset.positive_prompt or "",
-            asset.negative_prompt or "",
-            asset.used_resources or "",
-            asset.type or "",
-            asset.model_version or "",
-            asset.base_model or "",
-            asset.slug or "",
-            asset.creator or "",       # Creator added
-        ]).lower()
-        return all(kw in content for kw in keywords)
-
-    return list(filter(matches, all_assets))
+        query = query.filter(asset_crud.category_filter(db, category))
+
+    return paginate(db, query, response, sort, after, limit, view, ("search", q, category, nsfw_filter, fuzzy), sort_expr=sort_expr)
+
+def remove_media_files(media_files):
+    try:
+        # Delete each media file from the filesystem
+        for media_path in media_files:
+            # Skip if path is empty
+            if not media_path:
+                continue
+                
+            # Remove the leading slash if present and convert to OS-appropriate path
+            if media_path.startswith("/"):
+                media_path = media_path[1:]
+            
+            # Construct the absolute path to the file
+            abs_path = os.path.join(os.getcwd(), media_path)
+            
+            # Check if file exists and delete it
+            if os.path.exists(abs_path):
+                if os.path.isfile(abs_path):
+                    try:
+                        os.remove(abs_path)
+                        logger.debug("media file deleted path=%s", abs_path)
+                    except PermissionError:
+                        logger.warning("media file not deleted, permission denied path=%s", abs_path)
+                    except Exception as e:
+                        logger.warning("media file not deleted path=%s error=%s", abs_path, e)
+                else:
+                    logger.debug("media path skipped, not a file path=%s", abs_path)
+            else:
+                logger.debug("media file not found path=%s", abs_path)
+    except Exception as e:
+        logger.warning("media file deletion failed error=%s", e)
+        # Continue with asset deletion even if file deletion fails
+
+# Largest batch accepted by POST /bulk
+MAX_BULK_OPERATIONS = 1000
+
+@router.post("/bulk", response_model=schemas.AssetBulkResponse)
+def bulk_assets(request: schemas.AssetBulkRequest, db: Session = Depends(database.get_db)):
+    """
+    Apply many create/update/delete/favorite operations in one transaction and one commit.
+    Failed items are reported per index; with atomic=true nothing is applied if any item fails.
+    """
+    if len(request.operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"Höchstens {MAX_BULK_OPERATIONS} Operationen pro Anfrage")
+
+    try:
+        results, media_files = asset_crud.apply_bulk_operations(db, request.operations)
+        if request.atomic and any(result.status == "error" for result in results):
+            db.rollback()
+            for result in results:
+                if result.op == "create":
+                    result.id = None
+            return {"applied": False, "results": results}
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Fehler bei der Sammeländerung: {str(e)}")
+
+    # Files are only removed once the deletes are committed
+    remove_media_files(media_files)
+    return {"applied": True, "results": results}
 
 # New DELETE endpoint to delete an asset
 @router.delete("/{asset_id}", response_model=dict)
@@ -334,77 +429,22 @@ def delete_asset(asset_id: int, db: Session = Depends(database.get_db)):
     if not asset:
         raise HTTPException(status_code=404, detail="Asset nicht gefunden")
     
-    print(f"Deleting asset: {asset.id}, {asset.name}")
+    logger.debug("deleting asset id=%s name=%s", asset.id, asset.name)
     
     try:
-        # 1. First, remove references from other assets' linked_assets
-        all_assets = db.query(models.Asset).all()
-        
-        for other_asset in all_assets:
-            if other_asset.id == asset_id:
-                continue  # Skip the asset being deleted
-                
-            links = other_asset.linked_assets
-            if not links or not isinstance(links, list):
-                continue
-                
-            # If this asset is in the other asset's linked_assets, remove it
-            try:
-                if asset_id in links or str(asset_id) in links:
-                    # Convert to ints for proper comparison
-                    links = [int(x) if isinstance(x, str) and x.isdigit() else x for x in links]
-                    other_asset.linked_assets = [x for x in links if x != asset_id]
-                    print(f"Removed link to asset {asset_id} from asset {other_asset.id}")
-            except Exception as e:
-                print(f"Error updating links in asset {other_asset.id}: {str(e)}")
-                # Continue despite error
-
-        # 2. Try to delete associated media files
-        try:
-            # Get list of media files
-            media_files = asset.media_files or []
-            
-            # Delete each media file from the filesystem
-            for media_path in media_files:
-                # Skip if path is empty
-                if not media_path:
-                    continue
-                    
-                # Remove the leading slash if present and convert to OS-appropriate path
-                if media_path.startswith("/"):
-                    media_path = media_path[1:]
-                
-                # Construct the absolute path to the file
-                abs_path = os.path.join(os.getcwd(), media_path)
-                
-                # Check if file exists and delete it
-                if os.path.exists(abs_path):
-                    if os.path.isfile(abs_path):
-                        try:
-                            os.remove(abs_path)
-                            print(f"Deleted file: {abs_path}")
-                        except PermissionError:
-                            print(f"Permission denied when deleting: {abs_path}")
-                        except Exception as e:
-                            print(f"Error deleting file {abs_path}: {str(e)}")
-                    else:
-                        print(f"Skipping non-file: {abs_path}")
-                else:
-                    print(f"File not found: {abs_path}")
-        except Exception as e:
-            print(f"Error during media file deletion: {str(e)}")
-            # Continue with asset deletion even if file deletion fails
+        # 1. Try to delete associated media files
+        remove_media_files(asset.media_files or [])
         
-        # 3. Delete the asset from the database
+        # 2. Delete the asset from the database (its links in asset_links go with it)
         db.delete(asset)
         db.commit()
-        print(f"Asset deleted from database: {asset_id}")
+        logger.info("asset deleted id=%s", asset_id)
         return {"success": True, "message": f"Asset {asset_id} erfolgreich gelöscht"}
     
     except Exception as e:
         # Rollback on any error
         db.rollback()
-        print(f"Error deleting asset {asset_id}: {str(e)}")
+        logger.error("asset deletion failed id=%s error=%s", asset_id, e)
         raise HTTPException(status_code=500, detail=f"Fehler beim Löschen: {str(e)}")
 
 # Make sure to add the trailing slash version too
@@ -413,46 +453,29 @@ def delete_asset_with_slash(asset_id: int, db: Session = Depends(database.get_db
     return delete_asset(asset_id, db)
 
 
-@router.get("/{asset_id}", response_model=schemas.Asset)
-def get_asset(asset_id: int, db: Session = Depends(database.get_db)):
+# Deepest link expansion served by GET /{asset_id}?expand=linked
+MAX_LINK_DEPTH = 3
+
+@router.get("/{asset_id}", response_model=Union[schemas.AssetDetail, schemas.Asset])
+async def get_asset(asset_id: int, expand: Optional[str] = None, depth: int = 1, db: AsyncSession = Depends(database.get_async_db)):
+    return await db.run_sync(load_asset, asset_id, expand, depth)
+
+def load_asset(db: Session, asset_id: int, expand: Optional[str], depth: int):
     asset = db.query(models.Asset).filter(models.Asset.id == asset_id).first()
     if not asset:
         raise HTTPException(status_code=404, detail="Asset nicht gefunden")
     
-    # Ensure that linked_assets is a list
-    if asset.linked_assets is None:
-        asset.linked_assets = []
-    elif not isinstance(asset.linked_assets, list):
-        print(f"Warnung: linked_assets für Asset {asset_id} ist kein gültiges Format: {type(asset.linked_assets)}")
-        asset.linked_assets = []
-    
-    # Store original linked_assets IDs for response
-    linked_ids = asset.linked_assets.copy() if asset.linked_assets else []
-    
-    # If the asset has linked_assets IDs, we need to fetch the full assets for internal use
-    # but keep the ID list for the response
-    linked_assets_full = []
-    if asset.linked_assets and len(asset.linked_assets) > 0:
-        # This is a simple approach - in production, you might want to use a JOIN
-        for linked_id in asset.linked_assets:
-            try:
-                # Konvertiere linked_id zu int, falls es ein String ist
-                if isinstance(linked_id, str) and linked_id.isdigit():
-                    linked_id = int(linked_id)
-                
-                if isinstance(linked_id, int):
-                    linked_asset = db.query(models.Asset).filter(models.Asset.id == linked_id).first()
-                    if linked_asset:
-                        linked_assets_full.append(linked_asset)
-                else:
-                    print(f"Ungültiger linked_id Typ: {type(linked_id)} - Wert: {linked_id}")
-            except Exception as e:
-                print(f"Fehler beim Abrufen von linked_asset {linked_id}: {str(e)}")
-    
-    # Return the original asset with the IDs as linked_assets
-    # We don't replace linked_assets with the full objects to avoid validation errors
-    
-    # Make sure all linked_assets are integers to avoid validation errors
-    asset.linked_assets = [int(id) if isinstance(id, str) and id.isdigit() else id for id in linked_ids if isinstance(id, (int, str))]
-    
-    return asset
+    # linked_assets is read from asset_links (loaded with the asset)
+    if expand is None:
+        return schemas.Asset.model_validate(asset)
+    if expand != "linked":
+        raise HTTPException(status_code=400, detail=f"Unbekannte Erweiterung '{expand}', erlaubt: linked")
+    if not 1 <= depth <= MAX_LINK_DEPTH:
+        raise HTTPException(status_code=400, detail=f"depth muss zwischen 1 und {MAX_LINK_DEPTH} liegen")
+
+    # All linked assets up to depth in one query, embedded as summaries
+    linked = [
+        schemas.LinkedAssetSummary.model_validate(linked_asset).model_copy(update={"depth": distance})
+        for linked_asset, distance in asset_crud.linked_asset_summaries(db, asset_id, depth)
+    ]
+    return schemas.AssetDetail.model_validate(asset).model_copy(update={"linked": linked})
@@ -1,9 +1,11 @@
 # backend/routes/asset_type_routes.py
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from .. import database, models
+from .. import database, models, catalog
 from typing import List
 
 router = APIRouter()
@@ -11,14 +13,20 @@ router = APIRouter()
 class AssetTypeCreate(BaseModel):
     name: str
 
-@router.get("/", response_model=List[str])
-def get_asset_types(db: Session = Depends(database.get_db)):
+@router.get("/", response_model=List[str], dependencies=[Depends(catalog.conditional(catalog.ASSETS))])
+async def get_asset_types(db: AsyncSession = Depends(database.get_async_db)):
     """
     Return all unique asset types in the database.
     If none are found, default types are returned.
     """
+    return await db.run_sync(list_asset_types)
+
+# Shared by the async GET and the sync POST handler
+def list_asset_types(db: Session) -> List[str]:
     # Query all distinct types from the Asset table
-    result = db.query(models.Asset.type).distinct().filter(models.Asset.type != None).filter(models.Asset.type != "").all()
+    result = db.execute(
+        select(models.Asset.type).distinct().where(models.Asset.type != None).where(models.Asset.type != "")
+    ).all()
     
     # Filter out None values and extract the types from the tuples
     types = [t[0] for t in result if t[0]]
@@ -52,7 +60,7 @@ def add_asset_type(type_data: AssetTypeCreate, db: Session = Depends(database.ge
     so that it appears in the list of available types.
     """
     # Check if the type already exists
-    existing_types = get_asset_types(db)
+    existing_types = list_asset_types(db)
     if type_data.name in existing_types:
         return existing_types  # Type already exists, no change required
     
@@ -72,4 +80,4 @@ def add_asset_type(type_data: AssetTypeCreate, db: Session = Depends(database.ge
     db.commit()
     
     # Return updated list of types
-    return get_asset_types(db)
\ No newline at end of file
+    return list_asset_types(db)
\ No newline at end of file
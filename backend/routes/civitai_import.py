@@ -1,7 +1,7 @@
 # backend/routes/civitai_import.py
 
+import logging
 import os
-import requests
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -14,11 +14,16 @@ def sanitize_filename(filename):
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# requests is imported inside the handlers: it is only needed once an import actually runs
+
 class CivitaiImportRequest(BaseModel):
     civitai_url: str
     api_key: str | None = None
 
 def download_file(url, save_path):
+    import requests
     response = requests.get(url, timeout=15)
     if response.status_code == 200:
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
@@ -28,6 +33,7 @@ def download_file(url, save_path):
     return False
 
 def resolve_model_id_from_slug(slug_or_id: str, headers: dict) -> int:
+    import requests
     if slug_or_id.isdigit():
         return int(slug_or_id)
 
@@ -43,6 +49,7 @@ def resolve_model_id_from_slug(slug_or_id: str, headers: dict) -> int:
 
 @router.post("/from-civitai")
 def import_from_civitai(data: CivitaiImportRequest, request: Request, db: Session = Depends(database.get_db)):
+    import requests
     civitai_url = data.civitai_url
     headers = {"User-Agent": "Lokarni-Importer/1.0"}
     if data.api_key:
@@ -137,6 +144,7 @@ def import_single_image_post(image_id: int, request: Request, db: Session = Depe
     return import_single_image_internal(image_id, request, db)
 
 def import_single_image_internal(image_id: int, request: Request, db: Session):
+    import requests
     headers = {"User-Agent": "Lokarni-Importer/1.0"}
     if "civitai-api-key" in request.cookies:
         headers["Authorization"] = f"Bearer {request.cookies['civitai-api-key']}"
@@ -189,7 +197,8 @@ def import_single_image_internal(image_id: int, request: Request, db: Session):
 
 @router.get("/civitai/search")
 def search_models(query: str, api_key: str = None, limit: int = 100, page: int = 1, sort: str = None):
-    print(f"[Lokarni API] Suche empfangen: query='{query}', limit={limit}, page={page}, sort={sort}")
+    import requests
+    logger.debug("civitai search received query=%r limit=%s page=%s sort=%s", query, limit, page, sort)
 
     headers = {"User-Agent": "Lokarni-Importer/1.0"}
     if api_key:
@@ -201,7 +210,7 @@ def search_models(query: str, api_key: str = None, limit: int = 100, page: int =
         if sort:
             url += f"&sort={sort}"
             
-        print(f"[Lokarni API] Anfrage an CivitAI: {url}")
+        logger.debug("civitai search request url=%s", url)
         response = requests.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         data = response.json()
@@ -218,7 +227,7 @@ def search_models(query: str, api_key: str = None, limit: int = 100, page: int =
             
             # If deduplication is active, replace the items with the unique ones
             if len(unique_items) < len(data["items"]):
-                print(f"[Lokarni API] Deduplizierung: {len(data['items'])} -> {len(unique_items)} Ergebnisse")
+                logger.debug("civitai search deduplicated before=%s after=%s", len(data["items"]), len(unique_items))
                 data["items"] = unique_items
                 
         return data
@@ -1,12 +1,12 @@
 # backend/routes/civitai_test.py
 
-import requests
 from fastapi import APIRouter, Request, HTTPException
 
 router = APIRouter()
 
 @router.get("/test-api-key")
 def test_api_key(request: Request):
+    import requests
     api_key = request.headers.get("X-Civitai-Api-Key")
 
     if not api_key:
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
-from PIL import Image
 from io import BytesIO
 import re
 import json
+import logging
 import random
-import requests
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# PIL and requests are imported inside the handlers that use them, keeping startup light
+
 # Example mappings for "random" values
 PHOTO_TYPES = ["portrait", "landscape", "street photography", "fashion photography", "high fashion photography"]
 LIGHTING_TYPES = ["natural light", "studio lighting", "dramatic lighting", "soft lighting"]
@@ -174,7 +177,7 @@ def parse_comfy_workflow(text_chunks: dict) -> dict:
             result["Prompt"] = result["Prompt"] + ", " + ", ".join(set(lora_models))
 
     except Exception as e:
-        print(f"Error parsing workflow: {e}")
+        logger.warning("workflow parsing failed error=%s", e)
     return result
 
 def parse_parameters(text_chunks: dict) -> dict:
@@ -213,6 +216,7 @@ def parse_parameters(text_chunks: dict) -> dict:
 # Existing route for local files
 @router.post("/extract-metadata/")
 async def extract_image_metadata(file: UploadFile = File(...)):
+    from PIL import Image
     if not file.filename.lower().endswith(".png"):
         raise HTTPException(status_code=400, detail="Nur PNG-Dateien erlaubt.")
 
@@ -245,6 +249,8 @@ async def extract_image_metadata(file: UploadFile = File(...)):
 # New route for URL-based metadata extraction
 @router.post("/extract-metadata-url/")
 async def extract_image_metadata_from_url(request: ImageUrlRequest, req: Request):
+    import requests
+    from PIL import Image
     try:
         # Read API key from cookie if not provided in the request
         api_key = request.api_key
@@ -303,7 +309,7 @@ async def extract_image_metadata_from_url(request: ImageUrlRequest, req: Request
 # Helper function for Civitai metadata extraction
 async def extract_civitai_metadata(url: str, api_key: Optional[str] = None):
     try:
-        print(f"[DEBUG] Civitai URL received: {url}")
+        logger.debug("civitai url received url=%s", url)
         
         # Extract the image ID from the URL
         image_id = None
@@ -313,7 +319,7 @@ async def extract_civitai_metadata(url: str, api_key: Optional[str] = None):
             match = re.search(r'/images/(\d+)', url)
             if match:
                 image_id = match.group(1)
-                print(f"[DEBUG] Extracted image ID from web URL: {image_id}")
+                logger.debug("civitai image id from web url id=%s", image_id)
                 # This is a webpage URL, not a direct image
                 # We need to use the API
                 result = await get_civitai_metadata_by_id(image_id, api_key)
@@ -325,18 +331,18 @@ async def extract_civitai_metadata(url: str, api_key: Optional[str] = None):
         
         # Pattern for CDN URLs (e.g. https://image.civitai.com/.../00228-2584352429.jpeg)
         elif "image.civitai.com" in url:
-            print(f"[DEBUG] Detected CDN URL")
+            logger.debug("civitai cdn url detected")
             # The real ID is often the number after the dash
             match = re.search(r'/\d+-(\d+)\.(jpeg|jpg|png)', url)
             if match:
                 image_id = match.group(1)
-                print(f"[DEBUG] Extracted image ID from CDN URL: {image_id}")
+                logger.debug("civitai image id from cdn url id=%s", image_id)
             else:
                 # Alternatively try to find the largest number in the URL
                 numbers = re.findall(r'\d{6,}', url)  # Zahlen mit mindestens 6 Ziffern
                 if numbers:
                     image_id = max(numbers)  # Take the largest number
-                    print(f"[DEBUG] Extracted image ID from numbers: {image_id}")
+                    logger.debug("civitai image id from numbers id=%s", image_id)
             
             if image_id:
                 # Try the API first
@@ -358,8 +364,9 @@ async def extract_civitai_metadata(url: str, api_key: Optional[str] = None):
 # New function to scrape the Civitai page
 async def scrape_civitai_page(url: str, api_key: Optional[str] = None):
     """Fallback: Versuche die Webseite zu scrapen wenn die API nicht funktioniert"""
+    import requests
     try:
-        print(f"[DEBUG] Attempting to scrape Civitai page: {url}")
+        logger.debug("scraping civitai page url=%s", url)
         
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -437,6 +444,7 @@ async def scrape_civitai_page(url: str, api_key: Optional[str] = None):
 
 # New function for API fetch
 async def get_civitai_metadata_by_id(image_id: str, api_key: Optional[str] = None):
+    import requests
     try:
         headers = {"User-Agent": "Lokarni-Importer/1.0"}
         if api_key:
@@ -449,7 +457,7 @@ async def get_civitai_metadata_by_id(image_id: str, api_key: Optional[str] = Non
         ]
         
         for api_url in endpoints:
-            print(f"[DEBUG] Trying API endpoint: {api_url}")
+            logger.debug("trying civitai api endpoint url=%s", api_url)
             response = requests.get(api_url, headers=headers, timeout=15)
             
             if response.status_code == 200:
@@ -469,13 +477,13 @@ async def get_civitai_metadata_by_id(image_id: str, api_key: Optional[str] = Non
                 )
         
         # If no endpoint worked
-        print(f"[DEBUG] All API endpoints failed for ID: {image_id}")
+        logger.debug("all civitai api endpoints failed id=%s", image_id)
         return None
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[DEBUG] API error: {str(e)}")
+        logger.debug("civitai api error error=%s", e)
         return None
 
 def process_civitai_api_response(data: dict) -> dict:
@@ -560,6 +568,8 @@ def process_civitai_api_response(data: dict) -> dict:
 
 # Fallback for PNG extraction
 async def fallback_to_png_extraction(url: str):
+    import requests
+    from PIL import Image
     try:
         response = requests.get(url, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -0,0 +1,12 @@
+# backend/routes/metrics_routes.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..metrics import metrics
+
+router = APIRouter()
+
+# Prometheus scrape target; the values are collected by MetricsMiddleware
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
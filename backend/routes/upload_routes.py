@@ -2,7 +2,6 @@
 
 import os
 import uuid
-import aiohttp
 from fastapi import APIRouter, UploadFile, Form, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -37,6 +36,7 @@ class UrlUploadRequest(BaseModel):
 
 @router.post("/upload-url")
 async def upload_url(data: UrlUploadRequest):
+    import aiohttp  # imported on first use so startup does not pay for it
     ext = os.path.splitext(data.url.split("?")[0])[1] or ".jpg"
     filename = f"{uuid.uuid4()}{ext}"
     file_path = save_path(data.type, filename)
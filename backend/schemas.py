@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 
 # 🔹 Für API-Antworten (GET)
 class Asset(BaseModel):
@@ -39,6 +39,27 @@ class Asset(BaseModel):
     def dict_default(cls, custom_fields):
         return custom_fields or {}
 
+# 🔹 Schlanke Listenansicht für das Grid (view=summary)
+class AssetSummary(BaseModel):
+    id: int
+    name: str
+    type: str
+    preview_image: str
+    is_favorite: bool
+    nsfw_level: str
+
+    class Config:
+        from_attributes = True
+
+# 🔹 Verknüpftes Asset in der Detailansicht (expand=linked), depth = Abstand zum Asset
+class LinkedAssetSummary(AssetSummary):
+    tags: Optional[str] = ""  # Die Detailansicht zeigt die ersten Tags als Badges
+    depth: int = 1
+
+# 🔹 Detailansicht mit eingebetteten verknüpften Assets
+class AssetDetail(Asset):
+    linked: List[LinkedAssetSummary] = []
+
 # 🔹 Für neue Einträge (POST)
 class AssetCreate(BaseModel):
     name: str
@@ -107,7 +128,7 @@ class SubCategoryBase(BaseModel):
     order: int
 
 class SubCategoryCreate(SubCategoryBase):
-    pass
+    id: Optional[int] = None  # Beim Speichern des Baums: bestehende Subkategorie (sonst Abgleich über den Namen)
 
 class SubCategory(SubCategoryBase):
     id: int
@@ -120,6 +141,7 @@ class CategoryBase(BaseModel):
     order: int
 
 class CategoryCreate(CategoryBase):
+    id: Optional[int] = None  # Beim Speichern des Baums: bestehende Kategorie (sonst Abgleich über den Titel)
     subcategories: List[SubCategoryCreate] = []
 
 class Category(CategoryBase):
@@ -128,3 +150,25 @@ class Category(CategoryBase):
 
     class Config:
         from_attributes = True
+
+# 🔹 Sammeländerungen (POST /api/assets/bulk)
+class AssetBulkOperation(BaseModel):
+    op: str                                # "create", "update", "delete" oder "favorite"
+    id: Optional[int] = None               # Ziel für update, delete und favorite
+    data: Optional[Dict[str, Any]] = None  # Felder wie bei POST (create) bzw. PATCH (update)
+    is_favorite: Optional[bool] = None     # favorite: Wert setzen, ohne Angabe umschalten
+
+class AssetBulkRequest(BaseModel):
+    operations: List[AssetBulkOperation]
+    atomic: bool = False                   # True: bei einem Fehler wird nichts übernommen
+
+class AssetBulkResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: str                            # "ok" oder "error"
+    detail: Optional[str] = None
+
+class AssetBulkResponse(BaseModel):
+    applied: bool
+    results: List[AssetBulkResult]
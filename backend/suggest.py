@@ -0,0 +1,179 @@
+# backend/suggest.py
+#
+# Präfix-Baum für die Autovervollständigung im Keyword-Feld. Jeder Knoten kennt die
+# häufigsten Keywords seines Teilbaums, eine Eingabe kostet damit nur einen Abstieg um
+# so viele Knoten, wie das Präfix Zeichen hat. Der Baum wird einmal aus keyword_counts
+# gebaut und danach mit den Keyword-Änderungen jedes Commits nachgeführt. Ändert ein
+# anderer Prozess den Katalog, passt die Version nicht mehr und der Baum wird neu gebaut.
+# Eine Version, die der Baum nicht selbst gesehen hat, wird nie ungeprüft übernommen.
+
+import heapq
+import threading
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from . import catalog
+from .crud.keyword import top_keywords
+from .models import KeywordCount
+
+# Vorschläge, die jeder Knoten vorhält (Obergrenze für limit)
+SUGGEST_TOP_N = 20
+
+# Tiefer wird der Baum nicht; längere Präfixe treffen nur wenige Keywords und laufen
+# über die Bereichsabfrage auf dem Primärschlüssel von keyword_counts
+SUGGEST_MAX_DEPTH = 8
+
+
+class _Node:
+    __slots__ = ("children", "own", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.own = None  # {Keyword: Häufigkeit} der Keywords, die hier enden (oder auf max. Tiefe gekürzt sind)
+        self.top = []    # [(-Häufigkeit, Keyword), ...] des Teilbaums, höchstens top_n, bester zuerst
+
+
+class KeywordTrie:
+    def __init__(self, top_n: int = SUGGEST_TOP_N, max_depth: int = SUGGEST_MAX_DEPTH):
+        self.top_n = top_n
+        self.max_depth = max_depth
+        self.version = None  # Katalogversion, auf der der Baum steht (None = beim nächsten Zugriff neu bauen)
+        self._root = None
+        self._lock = threading.Lock()
+
+    def _path(self, keyword: str, create: bool) -> list:
+        node = self._root
+        path = [node]
+        for char in keyword[:self.max_depth]:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    break
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def _recompute(self, node: _Node):
+        candidates = [(-frequency, keyword) for keyword, frequency in (node.own or {}).items()]
+        for child in node.children.values():
+            candidates.extend(child.top)
+        node.top = heapq.nsmallest(self.top_n, candidates)
+
+    def _load(self, rows):
+        self._root = _Node()
+        for keyword, frequency in rows:
+            if frequency > 0:
+                node = self._path(keyword, create=True)[-1]
+                if node.own is None:
+                    node.own = {}
+                node.own[keyword] = frequency
+        # Von unten nach oben: jeder Knoten übernimmt die besten Einträge seiner Kinder
+        stack, order = [self._root], []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        for node in reversed(order):
+            self._recompute(node)
+
+    def rebuild(self, db: Session):
+        # Version zuerst lesen: kommt dazwischen ein Commit, ist der Baum höchstens neuer als
+        # seine Version und wird beim nächsten Zugriff noch einmal gebaut, nie umgekehrt
+        version = catalog.current_versions(db, catalog.ASSETS)[catalog.ASSETS]
+        rows = db.execute(select(KeywordCount.keyword, KeywordCount.frequency)).all()
+        with self._lock:
+            self._load(rows)
+            self.version = version
+
+    def apply(self, frequencies: dict):
+        """Übernimmt neue Gesamthäufigkeiten geänderter Keywords (0 = Keyword entfernt)."""
+        with self._lock:
+            if self._root is None:
+                return
+            for keyword, frequency in frequencies.items():
+                path = self._path(keyword, create=frequency > 0)
+                if len(path) - 1 < min(len(keyword), self.max_depth):
+                    continue  # Weder vorher noch jetzt im Baum
+                node = path[-1]
+                if frequency > 0:
+                    if node.own is None:
+                        node.own = {}
+                    node.own[keyword] = frequency
+                elif node.own:
+                    node.own.pop(keyword, None)
+                for node in reversed(path):
+                    self._recompute(node)
+                self._prune(keyword, path)
+
+    def _prune(self, keyword: str, path: list):
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if node.children or node.own:
+                break
+            del path[depth - 1].children[keyword[depth - 1]]
+
+    def committed(self, before: int, after: int):
+        """Nach einem eigenen Commit, dessen Keyword-Änderungen apply() schon übernommen hat."""
+        with self._lock:
+            # Nur wenn der Baum genau auf dem Stand vor der Transaktion war, ist er jetzt auf
+            # dem danach; sonst fehlt ihm etwas (anderer Prozess, paralleler Commit)
+            self.version = after if self.version == before else None
+
+    def complete(self, db: Session, prefix: str, limit: int = 10) -> list:
+        """Bis zu limit Keywords mit diesem Präfix als (Keyword, Häufigkeit), häufigste zuerst."""
+        prefix = prefix.lower()
+        limit = min(limit, self.top_n)
+        version = catalog.current_versions(db, catalog.ASSETS)[catalog.ASSETS]
+        with self._lock:
+            stale = self._root is None or self.version != version
+        if stale:
+            self.rebuild(db)
+
+        if len(prefix) > self.max_depth:
+            return [tuple(row) for row in top_keywords(db, prefix=prefix, limit=limit)]
+
+        with self._lock:
+            node = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [(keyword, -negative) for negative, keyword in node.top[:limit]]
+
+
+keyword_trie = KeywordTrie()
+
+
+# Geänderte Keywords sammelt backend.indexing in session.info["changed_keywords"]
+@event.listens_for(Session, "after_flush")
+def _read_changed_totals(session, flush_context):
+    # Nach dem Commit darf die Session kein SQL mehr ausführen, daher die Summen hier lesen
+    keywords = session.info.get("changed_keywords")
+    if keywords:
+        rows = session.connection().execute(
+            select(KeywordCount.keyword, KeywordCount.frequency).where(KeywordCount.keyword.in_(list(keywords)))
+        )
+        totals = dict(rows.all())
+        session.info["keyword_totals"] = {keyword: totals.get(keyword, 0) for keyword in keywords}
+
+
+# insert=True: vor dem Rückruf aus catalog, der die neue Version übernimmt
+@event.listens_for(Session, "after_commit", insert=True)
+def _apply_changed_totals(session):
+    session.info.pop("changed_keywords", None)
+    totals = session.info.pop("keyword_totals", None)
+    if totals:
+        keyword_trie.apply(totals)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_totals(session):
+    session.info.pop("changed_keywords", None)
+    session.info.pop("keyword_totals", None)
+
+
+# Eigene Commits erhöhen die Version, der Baum ist dann aber schon nachgeführt
+@catalog.subscribe
+def _follow_version(changes):
+    if catalog.ASSETS in changes:
+        keyword_trie.committed(*changes[catalog.ASSETS])
@@ -246,20 +246,14 @@ export default function AssetModal({ asset, onClose, onUpdate, onFetchAsset }) {
     if (Array.isArray(currentAsset.linked_assets) && currentAsset.linked_assets.length > 0) {
       const fetchLinkedAssets = async () => {
         try {
-          const linkedAssetsData = [];
-          for (const id of currentAsset.linked_assets) {
-            // Convert to number if it's a string (sometimes comes as a string from the API)
-            const assetId = typeof id === 'string' ? parseInt(id, 10) : id;
-            if (!isNaN(assetId)) {
-              // FIXED: Remove trailing slash to avoid 405 Method Not Allowed
-              const response = await fetch(`http://localhost:8000/api/assets/${assetId}`);
-              if (response.ok) {
-                const data = await response.json();
-                linkedAssetsData.push(data);
-              }
-            }
+          // One request: the backend embeds all linked assets as summaries
+          const response = await fetch(`http://localhost:8000/api/assets/${currentAsset.id}?expand=linked`);
+          if (response.ok) {
+            const data = await response.json();
+            setLinkedAssets(data.linked || []);
+          } else {
+            setLinkedAssets([]);
           }
-          setLinkedAssets(linkedAssetsData);
         } catch (error) {
           console.error("Error fetching linked assets:", error);
           setLinkedAssets([]);
@@ -41,8 +41,9 @@ export default function ManageContent() {
   const loadCategories = async () => {
     const res = await axios.get("/api/categories/");
     const data = res.data.map((cat) => ({
+      id: cat.id,
       title: cat.title,
-      items: cat.subcategories.map((s) => ({ name: s.name, icon: s.icon })),
+      items: cat.subcategories.map((s) => ({ id: s.id, name: s.name, icon: s.icon })),
     }));
     setCategories(data);
   };
@@ -56,10 +57,13 @@ export default function ManageContent() {
 
   const handleSave = async () => {
     setSaveStatus("saving");
+    // Ids let the backend save only what changed (renames keep their id)
     const payload = categories.map((cat, index) => ({
+      id: cat.id,
       title: cat.title,
       order: index,
       subcategories: cat.items.map((sub, i) => ({
+        id: sub.id,
         name: sub.name,
         icon: sub.icon,
         order: i,
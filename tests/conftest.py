@@ -0,0 +1,36 @@
+# tests/conftest.py
+#
+# Die Tests laufen gegen eine eigene SQLite-Datei; die URL muss gesetzt sein, bevor das
+# Backend importiert wird (Engine und Einstellungen entstehen beim Import).
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="lokarni-tests-")
+os.environ["LOKARNI_DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ.setdefault("LOKARNI_LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    # Mit Kontextmanager, damit der Lifespan-Hook Schema und Start-Kategorien anlegt
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    from backend.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
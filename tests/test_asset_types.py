@@ -0,0 +1,13 @@
+def test_add_asset_type_returns_updated_list(client):
+    response = client.post("/api/asset-types/", json={"name": "Upscaler"})
+    assert response.status_code == 200
+    assert "Upscaler" in response.json()
+
+    # Ein zweites Mal ändert nichts, die Liste bleibt gleich
+    again = client.post("/api/asset-types/", json={"name": "Upscaler"})
+    assert again.status_code == 200
+    assert again.json() == response.json()
+
+    listed = client.get("/api/asset-types/")
+    assert listed.status_code == 200
+    assert "Upscaler" in listed.json()
@@ -0,0 +1,59 @@
+def bulk(client, operations):
+    response = client.post("/api/assets/bulk", json={"operations": operations})
+    assert response.status_code == 200, response.text
+    assert all(result["status"] == "ok" for result in response.json()["results"])
+    return response
+
+
+def queries(response):
+    return int(response.headers["X-DB-Queries"])
+
+
+def run_batch(client, size):
+    created = bulk(client, [
+        {"op": "create", "data": {"name": f"heron {size} {i}", "type": "LoRA", "tags": f"wading{size}, bird{i}"}}
+        for i in range(size)
+    ])
+    ids = [result["id"] for result in created.json()["results"]]
+    updated = bulk(client, [
+        {"op": "update", "id": asset_id, "data": {"tags": f"crane{size}, bird{asset_id}", "linked_assets": ids[:2]}}
+        for asset_id in ids
+    ])
+    deleted = bulk(client, [{"op": "delete", "id": asset_id} for asset_id in ids])
+    return ids, [queries(created), queries(updated), queries(deleted)]
+
+
+def test_bulk_statement_count_does_not_grow_with_batch(client):
+    _, small = run_batch(client, 5)
+    _, large = run_batch(client, 40)
+    for few, many in zip(small, large):
+        assert many <= few + 2, (small, large)
+
+
+def test_bulk_keeps_search_tables_in_sync(client):
+    created = bulk(client, [
+        {"op": "create", "data": {"name": f"egret {i}", "type": "LoRA", "tags": "plumage"}} for i in range(12)
+    ])
+    ids = [result["id"] for result in created.json()["results"]]
+    assert len(set(ids)) == 12
+    assert [client.get(f"/api/assets/{asset_id}").json()["name"] for asset_id in ids] == [f"egret {i}" for i in range(12)]
+
+    keywords = client.get("/api/assets/keywords", params={"q": "plumage"}).json()
+    assert keywords == [{"word": "plumage", "count": 12}]
+    fuzzy = client.get("/api/assets/search", params={"q": "egrett", "fuzzy": True, "limit": 50}).json()
+    assert {asset["id"] for asset in fuzzy} >= set(ids)
+
+    # In Reihenfolge wie einzelne Aufrufe: erst verknüpft, dann von der anderen Seite wieder gelöst
+    first, second, third = ids[:3]
+    bulk(client, [
+        {"op": "update", "id": first, "data": {"linked_assets": [second, third]}},
+        {"op": "update", "id": second, "data": {"linked_assets": []}},
+    ])
+    assert client.get(f"/api/assets/{first}").json()["linked_assets"] == [third]
+    assert client.get(f"/api/assets/{second}").json()["linked_assets"] == []
+    assert client.get(f"/api/assets/{third}").json()["linked_assets"] == [first]
+
+    bulk(client, [{"op": "update", "id": first, "data": {"tags": "feathers"}}, {"op": "delete", "id": third}])
+    assert client.get(f"/api/assets/{first}").json()["linked_assets"] == []
+    keywords = client.get("/api/assets/keywords", params={"q": "plumage"}).json()
+    assert keywords == [{"word": "plumage", "count": 10}]
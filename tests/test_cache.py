@@ -0,0 +1,12 @@
+def test_unpaged_lists_are_not_cached(client):
+    from backend.cache import query_cache
+
+    assert client.post("/api/assets/", json={"name": "cached kestrel", "type": "LoRA"}).status_code == 200
+    query_cache.clear()
+
+    assert client.get("/api/assets", params={"sort": "name"}).status_code == 200
+    assert client.get("/api/assets/search", params={"q": "kestrel", "sort": "name"}).status_code == 200
+    assert query_cache.stats()["size"] == 0
+
+    assert client.get("/api/assets", params={"sort": "name", "limit": 10}).status_code == 200
+    assert query_cache.stats()["size"] == 1
@@ -0,0 +1,27 @@
+def tree(client):
+    response = client.get("/api/categories/")
+    assert response.status_code == 200
+    return response.json()
+
+
+def as_payload(categories):
+    return [
+        {"id": cat["id"], "title": cat["title"], "order": cat["order"],
+         "subcategories": [{"id": sub["id"], "name": sub["name"], "icon": sub["icon"], "order": sub["order"]}
+                           for sub in cat["subcategories"]]}
+        for cat in categories
+    ]
+
+
+def test_bulk_save_swaps_category_titles(client):
+    payload = as_payload(tree(client))
+    first, second = [cat for cat in payload if cat["title"] != "General"][:2]
+    first["title"], second["title"] = second["title"], first["title"]
+
+    response = client.post("/api/categories/bulk", json=payload)
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 2
+
+    titles = {cat["id"]: cat["title"] for cat in tree(client)}
+    assert titles[first["id"]] == first["title"]
+    assert titles[second["id"]] == second["title"]
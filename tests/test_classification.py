@@ -0,0 +1,27 @@
+def add_subcategory(client, name):
+    category_id = client.get("/api/categories/").json()[-1]["id"]
+    response = client.post(f"/api/categories/{category_id}/subcategories", json={"name": name, "icon": "Brush", "order": 99})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_new_asset_is_assigned_by_description(client, db):
+    from backend import schemas
+    from backend.crud.asset import auto_assign_subcategory
+
+    subcategory_id = add_subcategory(client, "Gouache")
+    asset = schemas.AssetCreate(name="flat washes", type="LoRA", description="Opaque gouache look")
+    assert auto_assign_subcategory(db, asset) == subcategory_id
+
+
+def test_new_subcategory_picks_up_assets_by_description_and_base_model(client):
+    by_description = client.post("/api/assets/", json={
+        "name": "dry brush", "type": "LoRA", "description": "Sumi-e ink strokes",
+    }).json()
+    by_base_model = client.post("/api/assets/", json={
+        "name": "bamboo", "type": "LoRA", "base_model": "Sumi-e XL",
+    }).json()
+
+    subcategory_id = add_subcategory(client, "Sumi-e")
+    for asset in (by_description, by_base_model):
+        assert client.get(f"/api/assets/{asset['id']}").json()["subcategory_id"] == subcategory_id
@@ -0,0 +1,14 @@
+from backend.database import engine_options
+
+
+def test_pool_size_only_for_file_databases():
+    assert "pool_size" in engine_options("sqlite:///lokarni.db")
+    assert "pool_size" in engine_options("postgresql://lokarni@localhost/lokarni")
+    for url in ("sqlite://", "sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"):
+        assert "pool_size" not in engine_options(url)
+        assert "max_overflow" not in engine_options(url)
+
+
+def test_check_same_thread_only_for_sqlite():
+    assert engine_options("sqlite+aiosqlite:///lokarni.db")["connect_args"] == {"check_same_thread": False}
+    assert "connect_args" not in engine_options("postgresql://lokarni@localhost/lokarni")
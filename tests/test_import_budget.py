@@ -0,0 +1,21 @@
+import json
+import os
+import subprocess
+import sys
+
+from backend.import_budget import DEFERRED_MODULES
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_main_does_not_load_heavy_dependencies():
+    # Frischer Interpreter: im Testprozess sind die Module womöglich schon geladen
+    probe = f"import sys, json; import backend.main; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_deferred_import_keeps_docstring():
+    from backend.routes.image_metadata_extract import scrape_civitai_page
+
+    assert scrape_civitai_page.__doc__.startswith("Fallback")
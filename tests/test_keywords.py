@@ -0,0 +1,21 @@
+import sys
+
+from backend.crud.keyword import prefix_upper_bound
+
+MAX_CHAR = chr(sys.maxunicode)
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("ab") == "ac"
+    assert prefix_upper_bound("a" + MAX_CHAR) == "b"
+    assert prefix_upper_bound("a퟿") == "a"
+    assert prefix_upper_bound(MAX_CHAR * 2) is None
+
+
+def test_keywords_with_highest_code_point(client):
+    response = client.get("/api/assets/keywords", params={"q": MAX_CHAR})
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = client.get("/api/assets/keywords", params={"q": "x" + MAX_CHAR})
+    assert response.status_code == 200
@@ -0,0 +1,9 @@
+def test_expanded_links_include_tags(client):
+    first = client.post("/api/assets/", json={"name": "osprey", "type": "LoRA", "tags": "raptor, fish"}).json()
+    second = client.post("/api/assets/", json={"name": "harrier", "type": "LoRA"}).json()
+    assert client.patch(f"/api/assets/{second['id']}", json={"linked_assets": [first["id"]]}).status_code == 200
+
+    response = client.get(f"/api/assets/{second['id']}", params={"expand": "linked"})
+    assert response.status_code == 200
+    linked = response.json()["linked"]
+    assert [(item["id"], item["tags"], item["depth"]) for item in linked] == [(first["id"], "raptor, fish", 1)]
@@ -0,0 +1,15 @@
+def test_nsfw_rating_of_unicode_digits():
+    from backend.models import nsfw_rating
+
+    assert nsfw_rating("²") == 1
+    assert nsfw_rating("٣") == 3
+    assert nsfw_rating(" 4 ") == 4
+    assert nsfw_rating("0") == 0
+    assert nsfw_rating(None) == 0
+
+
+def test_asset_with_superscript_nsfw_level(client):
+    response = client.post("/api/assets/", json={"name": "superscript", "type": "LoRA", "nsfw_level": "²"})
+    assert response.status_code == 200
+    safe = client.get("/api/assets", params={"nsfw_filter": True}).json()
+    assert response.json()["id"] not in [asset["id"] for asset in safe]
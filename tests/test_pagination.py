@@ -0,0 +1,30 @@
+from backend.crud.asset import encode_cursor
+
+
+def test_cursor_with_wrong_value_type_is_rejected(client):
+    # ["x"] als Cursor für die Sortierung nach id
+    response = client.get("/api/assets", params={"sort": "id", "after": "WyJ4Il0", "limit": 5})
+    assert response.status_code == 400
+
+    for sort, values in (
+        ("name", [1, 1]),
+        ("-created_at", [None, 1]),
+        ("favorite", ["1", 1]),
+        ("favorite", [True, 1]),
+        ("name", ["a", "1"]),
+    ):
+        response = client.get("/api/assets", params={"sort": sort, "after": encode_cursor(values), "limit": 5})
+        assert response.status_code == 400, (sort, values)
+
+
+def test_cursor_from_previous_page_is_accepted(client):
+    for index in range(3):
+        assert client.post("/api/assets/", json={"name": f"page-{index}", "type": "LoRA"}).status_code == 200
+
+    for sort in ("id", "-name", "created_at", "-favorite"):
+        first = client.get("/api/assets", params={"sort": sort, "limit": 1})
+        assert first.status_code == 200
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get("/api/assets", params={"sort": sort, "after": cursor, "limit": 1})
+        assert second.status_code == 200, sort
+        assert second.json()[0]["id"] != first.json()[0]["id"]
@@ -0,0 +1,11 @@
+def test_fuzzy_search_without_trigrams(client):
+    assert client.post("/api/assets/", json={"name": "ab, cd", "type": "LoRA"}).status_code == 200
+
+    for q in (",", " , ,"):
+        response = client.get("/api/assets/search", params={"q": q, "fuzzy": True})
+        assert response.status_code == 200, q
+        assert response.json() == []
+
+    response = client.get("/api/assets/search", params={"q": "ab", "fuzzy": True})
+    assert response.status_code == 200
+    assert "ab, cd" in [asset["name"] for asset in response.json()]
@@ -0,0 +1,50 @@
+def test_fresh_database_is_stamped_at_head(client):
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from backend import database
+    from backend.main import ALEMBIC_DIR, ensure_schema
+
+    with database.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    assert current == set(ScriptDirectory(ALEMBIC_DIR).get_heads())
+
+    # Der nächste Start nimmt den schnellen Weg ohne create_all
+    assert ensure_schema() is False
+
+
+def use_database(monkeypatch, tmp_path):
+    from sqlalchemy import create_engine
+    from backend import database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    return engine
+
+
+def test_outdated_revision_fails_fast(monkeypatch, tmp_path):
+    import pytest
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from sqlalchemy import text
+    from backend.main import ALEMBIC_DIR, ensure_schema
+
+    engine = use_database(monkeypatch, tmp_path)
+    initial = ScriptDirectory(ALEMBIC_DIR).get_base()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE assets (id INTEGER PRIMARY KEY, name VARCHAR)"))
+        MigrationContext.configure(connection).stamp(ScriptDirectory(ALEMBIC_DIR), initial)
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        ensure_schema()
+
+
+def test_unstamped_tables_log_a_warning(monkeypatch, tmp_path, caplog):
+    from sqlalchemy import text
+    from backend.main import ensure_schema
+
+    engine = use_database(monkeypatch, tmp_path)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE assets (id INTEGER PRIMARY KEY, name VARCHAR)"))
+
+    assert ensure_schema() is True
+    assert "alembic upgrade head" in caplog.text
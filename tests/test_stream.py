@@ -0,0 +1,19 @@
+import json
+
+from backend.routes import asset_routes
+
+
+def test_stream_sends_first_asset_right_away(client, monkeypatch):
+    for index in range(5):
+        assert client.post("/api/assets/", json={"name": f"stream-{index}", "type": "LoRA"}).status_code == 200
+    monkeypatch.setattr(asset_routes, "STREAM_BATCH_SIZE", 2)
+
+    chunks = list(asset_routes.stream_assets_ndjson())
+    lines = [line for chunk in chunks for line in chunk.splitlines()]
+    assert len(chunks[0].splitlines()) == 1
+    assert all(len(chunk.splitlines()) <= 2 for chunk in chunks)
+    assert len(lines) == len({json.loads(line)["id"] for line in lines})
+
+    response = client.get("/api/assets/stream")
+    assert response.status_code == 200
+    assert response.text.splitlines() == lines
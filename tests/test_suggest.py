@@ -0,0 +1,37 @@
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def suggest(client, q):
+    response = client.get("/api/assets/suggest", params={"q": q})
+    assert response.status_code == 200
+    return [entry["word"] for entry in response.json()]
+
+
+def test_local_commit_is_applied_without_rebuild(client, monkeypatch):
+    from backend.suggest import keyword_trie
+
+    suggest(client, "z")
+    rebuilds = []
+    original = keyword_trie.rebuild
+    monkeypatch.setattr(keyword_trie, "rebuild", lambda db: (rebuilds.append(1), original(db)))
+
+    response = client.post("/api/assets/", json={"name": "zebrafinch", "type": "LoRA"})
+    assert response.status_code == 200
+    assert "zebrafinch" in suggest(client, "zeb")
+    assert rebuilds == []
+
+
+def test_change_from_other_process_after_local_commit_rebuilds(client):
+    from backend import catalog, database
+    from backend.models import KeywordCount
+
+    suggest(client, "z")
+    response = client.post("/api/assets/", json={"name": "zeppelin", "type": "LoRA"})
+    assert response.status_code == 200
+
+    # Ein anderer Prozess schreibt direkt in die Datenbank, ohne Session-Events in diesem Prozess
+    with database.engine.begin() as connection:
+        connection.execute(sqlite_insert(KeywordCount).values(keyword="zeitgeist", frequency=3))
+        catalog.bump(connection, catalog.ASSETS)
+
+    assert "zeitgeist" in suggest(client, "ze")